@@ -0,0 +1,45 @@
+"""Index restaurant zip codes and include them in the search vector.
+
+Revision ID: 7c2e9d4a1f63
+Revises: e6c4a1f9b2d7
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "7c2e9d4a1f63"
+down_revision: Union[str, None] = "e6c4a1f9b2d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _search_vector_function(include_zip: bool) -> str:
+    zip_term = " || ' ' ||\n                coalesce(NEW.zip, '')" if include_zip else ""
+    return f"""
+        CREATE OR REPLACE FUNCTION update_location_search_vector()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.search_vector := to_tsvector('english',
+                coalesce((SELECT name FROM restaurants WHERE id = NEW.restaurant_id), '') || ' ' ||
+                coalesce(NEW.city, '') || ' ' ||
+                coalesce(NEW.state, ''){zip_term}
+            );
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """
+
+
+def upgrade() -> None:
+    op.create_index("ix_location_zip", "restaurant_locations", ["zip"])
+    op.execute(_search_vector_function(include_zip=True))
+    # Touch every row so the BEFORE UPDATE trigger rebuilds search_vector.
+    op.execute("UPDATE restaurant_locations SET zip = zip")
+
+
+def downgrade() -> None:
+    op.execute(_search_vector_function(include_zip=False))
+    op.execute("UPDATE restaurant_locations SET zip = zip")
+    op.drop_index("ix_location_zip", table_name="restaurant_locations")
@@ -0,0 +1,25 @@
+"""Add a content hash of imported fields to restaurants.
+
+Revision ID: 3b9e6f2d8a15
+Revises: 7c2e9d4a1f63
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "3b9e6f2d8a15"
+down_revision: Union[str, None] = "7c2e9d4a1f63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by scripts.import_restaurants; NULL until a row is (re)imported.
+    op.add_column("restaurants", sa.Column("content_hash", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("restaurants", "content_hash")
@@ -0,0 +1,54 @@
+"""Add shared menu templates with per-location overrides.
+
+Revision ID: 5e1a7c3d9b42
+Revises: 3b9e6f2d8a15
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "5e1a7c3d9b42"
+down_revision: Union[str, None] = "3b9e6f2d8a15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "menus",
+        sa.Column("is_template", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+    )
+    op.add_column(
+        "menus",
+        sa.Column("template_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.add_column(
+        "menus",
+        sa.Column("overrides", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    # A template still referenced by a location menu cannot be deleted.
+    op.create_foreign_key(
+        "fk_menus_template", "menus", "menus", ["template_id"], ["id"], ondelete="RESTRICT"
+    )
+    op.create_index("ix_menus_template", "menus", ["template_id"])
+    # Templates belong to no location; every other menu belongs to exactly one.
+    op.alter_column("menus", "restaurant_location_id", nullable=True)
+    op.create_check_constraint(
+        "ck_menus_template_location", "menus", "is_template = (restaurant_location_id IS NULL)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("ck_menus_template_location", "menus", type_="check")
+    op.execute("DELETE FROM menus WHERE template_id IS NOT NULL")
+    op.execute("DELETE FROM menus WHERE is_template")
+    op.alter_column("menus", "restaurant_location_id", nullable=False)
+    op.drop_index("ix_menus_template", table_name="menus")
+    op.drop_constraint("fk_menus_template", "menus", type_="foreignkey")
+    op.drop_column("menus", "overrides")
+    op.drop_column("menus", "template_id")
+    op.drop_column("menus", "is_template")
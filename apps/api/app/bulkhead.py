@@ -0,0 +1,76 @@
+"""
+Bulkheads that keep one class of traffic from starving the others.
+
+Each traffic class (admin, public reads, order writes) gets its own
+connection pool in `app.database` and a concurrency limit here. A request
+that cannot get a slot within the class's queue timeout is rejected with
+503 instead of queueing behind slow work from the same class.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException
+
+from app.config import settings
+
+
+class Bulkhead:
+    def __init__(self, name: str, max_concurrent: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail=f"Too many concurrent {self.name} requests; retry shortly.",
+                headers={"Retry-After": "1"},
+            ) from None
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "queue_timeout": self.queue_timeout,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+admin_bulkhead = Bulkhead(
+    "admin", settings.bulkhead_admin_concurrency, settings.bulkhead_admin_queue_timeout
+)
+public_bulkhead = Bulkhead(
+    "public", settings.bulkhead_public_concurrency, settings.bulkhead_public_queue_timeout
+)
+order_bulkhead = Bulkhead(
+    "order", settings.bulkhead_order_concurrency, settings.bulkhead_order_queue_timeout
+)
+
+
+def bulkhead_stats() -> dict:
+    return {b.name: b.stats() for b in (admin_bulkhead, public_bulkhead, order_bulkhead)}
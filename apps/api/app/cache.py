@@ -0,0 +1,243 @@
+"""
+In-process response cache for hot read endpoints.
+
+Services look values up by key before querying Postgres and store what they
+built on a miss. Writers invalidate the precise keys they touch, and every
+entry also expires after a TTL as a safety net. The backend is pluggable via
+`settings.cache_backend`; "none" turns caching off without touching callers.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.serialization import json_key
+
+STATES_KEY = "browse:states"
+
+# Cap on the number of keys whose hit/miss counters are retained.
+MAX_TRACKED_KEYS = 10_000
+
+
+def cities_key(state: str, page: int, page_size: int) -> str:
+    return f"browse:cities:{state.upper()}:{page}:{page_size}"
+
+
+def cities_prefix(state: str) -> str:
+    return f"browse:cities:{state.upper()}:"
+
+
+def city_restaurants_key(state_slug: str, city_slug: str, page: int, page_size: int) -> str:
+    return f"browse:restaurants:{state_slug.lower()}/{city_slug.lower()}:{page}:{page_size}"
+
+
+def city_restaurants_prefix(state_slug: str, city_slug: str) -> str:
+    return f"browse:restaurants:{state_slug.lower()}/{city_slug.lower()}:"
+
+
+def restaurant_key(state_slug: str, city_slug: str, restaurant_slug: str) -> str:
+    return f"restaurant:{state_slug.lower()}/{city_slug.lower()}/{restaurant_slug.lower()}"
+
+
+def menu_key(state_slug: str, city_slug: str, restaurant_slug: str) -> str:
+    return f"menu:{state_slug.lower()}/{city_slug.lower()}/{restaurant_slug.lower()}"
+
+
+def menu_keys(state_slug: str, city_slug: str, restaurant_slug: str) -> list[str]:
+    """Every cached representation of a restaurant's active menu."""
+    key = menu_key(state_slug, city_slug, restaurant_slug)
+    return [key, json_key(key)]
+
+
+def location_keys(state_slug: str, city_slug: str, restaurant_slug: str) -> tuple[list[str], list[str]]:
+    """(keys, prefixes) to drop when a restaurant location is created or changed."""
+    keys = [
+        STATES_KEY,
+        restaurant_key(state_slug, city_slug, restaurant_slug),
+        *menu_keys(state_slug, city_slug, restaurant_slug),
+    ]
+    prefixes = [
+        cities_prefix(state_slug),
+        city_restaurants_prefix(state_slug, city_slug),
+    ]
+    return keys, prefixes
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory cost of a cached value in bytes."""
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, BaseModel):
+        return len(value.__pydantic_serializer__.to_json(value))
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value) + sys.getsizeof(value)
+    return sys.getsizeof(value)
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None: ...
+
+    def invalidate(self, *keys: str) -> None: ...
+
+    def invalidate_prefix(self, *prefixes: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self, limit: int = 50) -> dict: ...
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float
+
+
+class NullCache:
+    def get(self, key: str) -> Any | None:
+        return None
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        pass
+
+    def invalidate(self, *keys: str) -> None:
+        pass
+
+    def invalidate_prefix(self, *prefixes: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self, limit: int = 50) -> dict:
+        return {"backend": "none"}
+
+
+class MemoryCache:
+    """LRU cache bounded by total estimated bytes, with per-entry TTL."""
+
+    def __init__(self, max_bytes: int, default_ttl: float):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._key_stats: OrderedDict[str, list[int]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _record(self, key: str, hit: bool) -> None:
+        counters = self._key_stats.get(key)
+        if counters is None:
+            counters = self._key_stats[key] = [0, 0]
+            if len(self._key_stats) > MAX_TRACKED_KEYS:
+                self._key_stats.popitem(last=False)
+        else:
+            self._key_stats.move_to_end(key)
+        counters[0 if hit else 1] += 1
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._drop(key)
+            self._record(key, hit=False)
+            return None
+        self._entries.move_to_end(key)
+        self._record(key, hit=True)
+        return entry.value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        self._drop(key)
+        self._entries[key] = _Entry(
+            value=value,
+            size=size,
+            expires_at=time.monotonic() + (self.default_ttl if ttl is None else ttl),
+        )
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            if key in self._entries:
+                self._drop(key)
+                self.invalidations += 1
+
+    def invalidate_prefix(self, *prefixes: str) -> None:
+        if not prefixes:
+            return
+        for key in [k for k in self._entries if k.startswith(prefixes)]:
+            self._drop(key)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self, limit: int = 50) -> dict:
+        lookups = self.hits + self.misses
+        top_keys = sorted(
+            self._key_stats.items(), key=lambda kv: kv[1][0] + kv[1][1], reverse=True
+        )[:limit]
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "keys": [
+                {"key": key, "hits": hits, "misses": misses}
+                for key, (hits, misses) in top_keys
+            ],
+        }
+
+
+def location_invalidations(slugs) -> tuple[set[str], set[str]]:
+    """(keys, prefixes) derived from many (state, city, restaurant) slug triples."""
+    keys: set[str] = set()
+    prefixes: set[str] = set()
+    for state_slug, city_slug, restaurant_slug in slugs:
+        location_k, location_p = location_keys(state_slug, city_slug, restaurant_slug)
+        keys.update(location_k)
+        prefixes.update(location_p)
+    return keys, prefixes
+
+
+def build_cache() -> CacheBackend:
+    if settings.cache_backend == "none":
+        return NullCache()
+    return MemoryCache(
+        max_bytes=settings.cache_max_bytes,
+        default_ttl=settings.cache_ttl_seconds,
+    )
+
+
+response_cache: CacheBackend = build_cache()
@@ -0,0 +1,65 @@
+"""
+Helpers for conditional GET (ETag / Last-Modified validators).
+
+Validators are derived from cheap version lookups (ids and `updated_at`
+columns), so a revalidation that ends in 304 never loads the full object
+graph or serializes a body.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+# Bumped whenever a response schema changes so stale validators never match.
+ETAG_SCHEMA_VERSION = "1"
+
+CACHE_CONTROL = "public, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha256(
+        "|".join([ETAG_SCHEMA_VERSION, *map(str, parts)]).encode("utf-8")
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def validator_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x".
+    candidates = (c.strip().removeprefix("W/") for c in header.split(","))
+    return etag in candidates
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None
+) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution.
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,81 @@
+"""
+Read-your-writes routing for replica reads.
+
+Replica reads may lag the primary, so a client that just wrote is pinned to
+the primary for `read_after_write_seconds`. Successful writes stamp the
+response with a cookie (for browsers) and a header (for server-side callers
+such as the Next.js app, which echo it back on their next request).
+"""
+
+import hashlib
+import hmac
+import math
+import secrets
+import time
+
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+COOKIE_NAME = "takeout_primary_until"
+HEADER_NAME = "X-Primary-Until"
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+_SECRET = (settings.read_after_write_secret or secrets.token_hex(32)).encode()
+
+
+def _signature(until: str) -> str:
+    return hmac.new(_SECRET, until.encode(), hashlib.sha256).hexdigest()
+
+
+def sign_stamp(until: float) -> str:
+    value = f"{until:.3f}"
+    return f"{value}.{_signature(value)}"
+
+
+def wants_primary(request: Request) -> bool:
+    raw = request.headers.get(HEADER_NAME) or request.cookies.get(COOKIE_NAME)
+    if not raw:
+        return False
+    # Pinned reads skip the response cache and single-flight, so an
+    # unsigned stamp would let any client send all its reads to the primary.
+    value, _, signature = raw.rpartition(".")
+    if not value or not hmac.compare_digest(signature, _signature(value)):
+        return False
+    try:
+        until = float(value)
+    except ValueError:
+        return False
+    remaining = until - time.time()
+    # Ignore stamps further out than we would ever issue so clients cannot
+    # pin themselves to the primary indefinitely.
+    return 0 < remaining <= settings.read_after_write_seconds
+
+
+class RecentWriteMiddleware:
+    """Stamp successful write responses so follow-up reads use the primary."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = sign_stamp(time.time() + settings.read_after_write_seconds)
+                headers = MutableHeaders(scope=message)
+                headers.append(HEADER_NAME, until)
+                headers.append(
+                    "Set-Cookie",
+                    f"{COOKIE_NAME}={until}; Max-Age="
+                    f"{math.ceil(settings.read_after_write_seconds)}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
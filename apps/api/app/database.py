@@ -1,13 +1,222 @@
+import time
+import uuid
 from collections.abc import AsyncGenerator
+from contextlib import AsyncExitStack
 
+from fastapi import Request
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
+from app.bulkhead import Bulkhead, admin_bulkhead, order_bulkhead, public_bulkhead
 from app.config import settings
+from app.consistency import wants_primary
+from app.query_stats import instrument_engine
 
-engine = create_async_engine(settings.database_url, echo=settings.debug)
-async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+class BulkheadSession(AsyncSession):
+    """AsyncSession that takes a bulkhead slot just before its first query.
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_maker() as session:
+    Requests answered from the response cache never query, so they neither
+    wait on nor get rejected by the bulkhead. The slot is released on close.
+    """
+
+    def __init__(self, *args, bulkhead: Bulkhead | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._bulkhead = bulkhead
+        self._slot: AsyncExitStack | None = None
+
+    async def _acquire_slot(self) -> None:
+        if self._bulkhead is None or self._slot is not None:
+            return
+        slot = AsyncExitStack()
+        await slot.enter_async_context(self._bulkhead.slot())
+        self._slot = slot
+
+    async def execute(self, *args, **kwargs):
+        await self._acquire_slot()
+        return await super().execute(*args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        await self._acquire_slot()
+        return await super().scalar(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        await self._acquire_slot()
+        return await super().get(*args, **kwargs)
+
+    async def stream(self, *args, **kwargs):
+        await self._acquire_slot()
+        return await super().stream(*args, **kwargs)
+
+    async def connection(self, *args, **kwargs):
+        await self._acquire_slot()
+        return await super().connection(*args, **kwargs)
+
+    async def close(self) -> None:
+        try:
+            await super().close()
+        finally:
+            if self._slot is not None:
+                slot, self._slot = self._slot, None
+                await slot.aclose()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+def _engine_options(
+    pool_size: int = settings.db_pool_size,
+    max_overflow: int = settings.db_max_overflow,
+    pool_timeout: float = settings.db_pool_timeout,
+) -> dict:
+    connect_args: dict = {"statement_cache_size": settings.db_statement_cache_size}
+    if settings.db_pgbouncer:
+        # PgBouncer in transaction mode hands each transaction to any server
+        # connection, so named prepared statements must not be reused or
+        # collide across clients.
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+
+    options: dict = {
+        "echo": settings.db_echo,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": connect_args,
+    }
+    if settings.db_null_pool:
+        # Let PgBouncer do all pooling; every session opens a fresh client connection.
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=InstrumentedPool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return options
+
+
+engine = create_async_engine(settings.database_url, **_engine_options())
+async_session_maker = async_sessionmaker(engine, class_=BulkheadSession, expire_on_commit=False)
+
+if settings.database_read_url:
+    read_engine = create_async_engine(settings.database_read_url, **_engine_options())
+    read_session_maker = async_sessionmaker(
+        read_engine, class_=BulkheadSession, expire_on_commit=False
+    )
+else:
+    read_engine = engine
+    read_session_maker = async_session_maker
+
+admin_engine = create_async_engine(
+    settings.database_url,
+    **_engine_options(
+        settings.db_admin_pool_size,
+        settings.db_admin_max_overflow,
+        settings.db_admin_pool_timeout,
+    ),
+)
+admin_session_maker = async_sessionmaker(admin_engine, class_=AsyncSession, expire_on_commit=False)
+
+order_engine = create_async_engine(
+    settings.database_url,
+    **_engine_options(
+        settings.db_order_pool_size,
+        settings.db_order_max_overflow,
+        settings.db_order_pool_timeout,
+    ),
+)
+order_session_maker = async_sessionmaker(order_engine, class_=AsyncSession, expire_on_commit=False)
+
+if settings.query_stats_enabled:
+    for _engine in {engine, read_engine, admin_engine, order_engine}:
+        instrument_engine(_engine)
+
+# Session.info flag for primary reads made to honour read-your-writes.
+PINNED_PRIMARY = "pinned_primary"
+
+
+def is_pinned_primary(db: AsyncSession) -> bool:
+    """True when shared caches must be bypassed because the client just wrote."""
+    return db.info.get(PINNED_PRIMARY, False)
+
+
+def _pool_stats(pool) -> dict:
+    if not isinstance(pool, InstrumentedPool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # Negative while the pool has not yet opened `size` connections.
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": pool.checkouts,
+        "timeouts": pool.timeouts,
+        "wait_ms_avg": (
+            round(pool.wait_seconds_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0
+        ),
+        "wait_ms_max": round(pool.wait_seconds_max * 1000, 3),
+        "wait_seconds_total": round(pool.wait_seconds_total, 6),
+    }
+
+
+def pool_stats() -> dict:
+    stats = {"primary": _pool_stats(engine.pool)}
+    if read_engine is not engine:
+        stats["read"] = _pool_stats(read_engine.pool)
+    stats["admin"] = _pool_stats(admin_engine.pool)
+    stats["order"] = _pool_stats(order_engine.pool)
+    return stats
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for public reads: the replica unless the client just wrote.
+
+    Read routes depend on this with `scope="function"` so the session is
+    closed as soon as the endpoint returns, before the response is
+    serialized and sent. The public bulkhead slot is only taken once the
+    session runs its first query, so response-cache hits skip the queue.
+    """
+    if read_session_maker is async_session_maker:
+        maker, info = async_session_maker, {}
+    elif wants_primary(request):
+        maker, info = async_session_maker, {PINNED_PRIMARY: True}
+    else:
+        maker, info = read_session_maker, {}
+    async with maker(info=info, bulkhead=public_bulkhead) as session:
+        yield session
+
+
+async def get_admin_db() -> AsyncGenerator[AsyncSession, None]:
+    async with admin_bulkhead.slot(), admin_session_maker() as session:
+        yield session
+
+
+async def get_order_db() -> AsyncGenerator[AsyncSession, None]:
+    async with order_bulkhead.slot(), order_session_maker() as session:
         yield session
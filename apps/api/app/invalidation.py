@@ -0,0 +1,183 @@
+"""
+Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+Writers call `publish_invalidation` inside their write transaction; Postgres
+delivers the notification to every listener only if that transaction
+commits. Each worker holds one dedicated asyncpg connection that LISTENs on
+CHANNEL and evicts matching keys from its local cache. Notifications sent
+while a listener is disconnected are lost, so every (re)connect starts with
+a full local flush.
+
+When reads go to a lagging replica, a read racing the write can re-cache
+pre-write data, so each invalidation is applied a second time once the
+replica has had `read_after_write_seconds` to catch up.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable, Iterable
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import CacheBackend, response_cache
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidate"
+
+# Postgres caps NOTIFY payloads at 8000 bytes.
+MAX_PAYLOAD_BYTES = 7500
+
+# Called with (keys, prefixes) per message, or (None, None) on a full flush.
+Subscriber = Callable[[list[str] | None, list[str] | None], None]
+
+
+def _payloads(keys: Iterable[str], prefixes: Iterable[str]) -> list[str]:
+    payloads: list[str] = []
+    batch: dict[str, list[str]] = {"k": [], "p": []}
+    size = 0
+    for field, values in (("k", keys), ("p", prefixes)):
+        for value in values:
+            # Quotes and separator add a few bytes per entry.
+            entry_size = len(value.encode("utf-8")) + 4
+            if size + entry_size > MAX_PAYLOAD_BYTES and size:
+                payloads.append(json.dumps(batch, separators=(",", ":")))
+                batch = {"k": [], "p": []}
+                size = 0
+            batch[field].append(value)
+            size += entry_size
+    if size:
+        payloads.append(json.dumps(batch, separators=(",", ":")))
+    return payloads
+
+
+async def publish_invalidation(
+    db: AsyncSession,
+    keys: Iterable[str] = (),
+    prefixes: Iterable[str] = (),
+) -> None:
+    """Queue an invalidation that every worker applies once `db` commits."""
+    for payload in _payloads(sorted(set(keys)), sorted(set(prefixes))):
+        await db.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+def _listener_dsn(database_url: str) -> str:
+    # asyncpg wants a plain postgresql:// DSN, not the SQLAlchemy dialect URL.
+    return make_url(database_url).set(drivername="postgresql").render_as_string(
+        hide_password=False
+    )
+
+
+class InvalidationListener:
+    def __init__(
+        self,
+        database_url: str,
+        cache: CacheBackend,
+        health_check_seconds: float = 30.0,
+        max_backoff_seconds: float = 30.0,
+        replay_after_seconds: float | None = None,
+    ):
+        self.dsn = _listener_dsn(database_url)
+        self.cache = cache
+        self.health_check_seconds = health_check_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.replay_after_seconds = replay_after_seconds
+        self.subscribers: list[Subscriber] = []
+        self.connected = False
+        self.messages = 0
+        self.reconnects = 0
+        self.full_flushes = 0
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.append(subscriber)
+
+    def _notify_subscribers(self, keys: list[str] | None, prefixes: list[str] | None) -> None:
+        for subscriber in self.subscribers:
+            try:
+                subscriber(keys, prefixes)
+            except Exception:
+                logger.exception("Invalidation subscriber failed")
+
+    def _flush(self) -> None:
+        self.full_flushes += 1
+        self.cache.clear()
+        self._notify_subscribers(None, None)
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        self.messages += 1
+        try:
+            message = json.loads(payload)
+            keys = list(message.get("k", []))
+            prefixes = list(message.get("p", []))
+        except (ValueError, AttributeError, TypeError):
+            logger.warning("Malformed invalidation payload; flushing local cache")
+            self._flush()
+            return
+        self._apply(keys, prefixes)
+        if self.replay_after_seconds:
+            asyncio.get_running_loop().call_later(
+                self.replay_after_seconds, self._apply, keys, prefixes
+            )
+
+    def _apply(self, keys: list[str], prefixes: list[str]) -> None:
+        self.cache.invalidate(*keys)
+        self.cache.invalidate_prefix(*prefixes)
+        self._notify_subscribers(keys, prefixes)
+
+    async def _listen_once(self) -> None:
+        lost = asyncio.Event()
+        connection = await asyncpg.connect(self.dsn)
+        try:
+            connection.add_termination_listener(lambda _: lost.set())
+            await connection.add_listener(CHANNEL, self._on_notification)
+            self.connected = True
+            # Anything published while we were away was missed.
+            self._flush()
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), self.health_check_seconds)
+                except asyncio.TimeoutError:
+                    # Half-open TCP connections only surface on use.
+                    await connection.execute("SELECT 1")
+        finally:
+            self.connected = False
+            if not connection.is_closed():
+                await connection.close(timeout=5)
+
+    async def run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                await self._listen_once()
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "Invalidation listener disconnected (%s); retrying in %.0fs", exc, backoff
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff_seconds)
+            self.reconnects += 1
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "messages": self.messages,
+            "reconnects": self.reconnects,
+            "full_flushes": self.full_flushes,
+        }
+
+
+invalidation_listener = InvalidationListener(
+    settings.cache_bus_database_url or settings.database_url,
+    response_cache,
+    replay_after_seconds=(
+        settings.read_after_write_seconds if settings.database_read_url else None
+    ),
+)
@@ -1,9 +1,17 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy import exc as sa_exc
 
 from app.config import settings
+from app.consistency import HEADER_NAME, RecentWriteMiddleware
+from app.database import read_session_maker
+from app.invalidation import invalidation_listener
+from app.metrics import MetricsMiddleware, run_sampler, track_in_progress
+from app.query_stats import QueryStatsMiddleware
 from app.routers import (
     admin,
     admin_menus,
@@ -15,21 +23,83 @@ from app.routers import (
     search,
     sitemap,
 )
+from app.services.search_index import search_index
+from app.services.sitemap import invalidate_sitemap
+
+
+def _locations_changed(keys: list[str] | None, prefixes: list[str] | None) -> bool:
+    # A full flush (None) means notifications may have been missed.
+    return keys is None or any(key.startswith("restaurant:") for key in keys)
+
+
+def _refresh_search_index(keys: list[str] | None, prefixes: list[str] | None) -> None:
+    if _locations_changed(keys, prefixes):
+        search_index.request_refresh()
+
+
+def _recheck_sitemap(keys: list[str] | None, prefixes: list[str] | None) -> None:
+    if _locations_changed(keys, prefixes):
+        invalidate_sitemap()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    tasks: list[asyncio.Task] = []
+    if settings.metrics_enabled:
+        tasks.append(asyncio.create_task(run_sampler(settings.metrics_sample_seconds)))
+    if settings.cache_bus_enabled:
+        invalidation_listener.subscribe(_recheck_sitemap)
+        tasks.append(asyncio.create_task(invalidation_listener.run()))
+    if settings.search_backend == "memory":
+        invalidation_listener.subscribe(_refresh_search_index)
+        tasks.append(
+            asyncio.create_task(
+                search_index.run_refresh_loop(
+                    read_session_maker,
+                    settings.search_index_refresh_seconds,
+                    settings.search_index_prune_seconds,
+                )
+            )
+        )
+
     yield
 
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+
+app = FastAPI(
+    title="Chinese Takeout API",
+    version="0.1.0",
+    lifespan=lifespan,
+    dependencies=[Depends(track_in_progress)] if settings.metrics_enabled else [],
+)
+
 
-app = FastAPI(title="Chinese Takeout API", version="0.1.0", lifespan=lifespan)
+@app.exception_handler(sa_exc.TimeoutError)
+async def pool_timeout_handler(request: Request, exc: sa_exc.TimeoutError):
+    # The request's connection pool is exhausted; shed load rather than 500.
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database busy; retry shortly."},
+        headers={"Retry-After": "1"},
+    )
 
+app.add_middleware(RecentWriteMiddleware)
+if settings.query_stats_enabled:
+    app.add_middleware(QueryStatsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[o.strip() for o in settings.cors_origins.split(",")],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[HEADER_NAME],
 )
+if settings.metrics_enabled:
+    # Outermost, so latency covers every other middleware.
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(health.router)
 app.include_router(browse.router)
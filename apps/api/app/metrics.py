@@ -0,0 +1,192 @@
+"""
+Prometheus metrics served at `/metrics`.
+
+Request latency and in-flight gauges are labelled by route template, so
+cardinality is bounded by the route table rather than by URLs. Pool, cache
+and bulkhead figures already live in process-local counters; a background
+sampler copies them into metrics every `metrics_sample_seconds` so the hot
+paths pay nothing extra.
+
+Under gunicorn, `PROMETHEUS_MULTIPROC_DIR` is set (see gunicorn.conf.py) and
+every worker writes to memory-mapped files in that directory; `/metrics`
+aggregates them, so any worker can answer a scrape.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncGenerator
+
+from fastapi import Request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.bulkhead import bulkhead_stats
+from app.cache import response_cache
+from app.database import pool_stats
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served, by route template.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+
+ORDERS_CREATED = Counter("orders_created_total", "Orders created.")
+ORDER_FAILURES = Counter(
+    "order_create_failures_total", "Order creations rejected, by reason.", ["reason"]
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Pooled connections by pool and state (checked_out, idle, overflow).",
+    ["pool", "state"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Pool checkouts.", ["pool"])
+DB_POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Pool checkouts that timed out.", ["pool"])
+DB_POOL_WAIT = Counter(
+    "db_pool_wait_seconds_total", "Time spent waiting for a pooled connection.", ["pool"]
+)
+
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Response cache lookups.", ["result"])
+CACHE_EVICTIONS = Counter("cache_evictions_total", "Response cache LRU evictions.")
+CACHE_BYTES = Gauge(
+    "cache_bytes", "Estimated bytes held by the response cache.", multiprocess_mode="livesum"
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries", "Entries held by the response cache.", multiprocess_mode="livesum"
+)
+
+BULKHEAD_ACTIVE = Gauge(
+    "bulkhead_active", "Requests holding a bulkhead slot.", ["bulkhead"],
+    multiprocess_mode="livesum",
+)
+BULKHEAD_WAITING = Gauge(
+    "bulkhead_waiting", "Requests queued for a bulkhead slot.", ["bulkhead"],
+    multiprocess_mode="livesum",
+)
+BULKHEAD_REJECTED = Counter(
+    "bulkhead_rejected_total", "Requests rejected by a bulkhead.", ["bulkhead"]
+)
+
+
+def _route_template(scope: Scope) -> str:
+    # The router stores the matched route in the scope before dispatching.
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """Time each HTTP request, labelled by the route that served it."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_LATENCY.labels(scope["method"], _route_template(scope), str(status)).observe(
+                time.perf_counter() - started
+            )
+
+
+async def track_in_progress(request: Request) -> AsyncGenerator[None, None]:
+    """App-wide dependency; it runs once routing has picked the route."""
+    gauge = REQUESTS_IN_PROGRESS.labels(request.method, _route_template(request.scope))
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+class _Deltas:
+    """Turn cumulative process-local totals into Counter increments."""
+
+    def __init__(self):
+        self._last: dict[tuple, float] = {}
+
+    def inc(self, counter, total: float, *labels: str) -> None:
+        key = (counter, labels)
+        delta = total - self._last.get(key, 0)
+        self._last[key] = total
+        if delta > 0:
+            (counter.labels(*labels) if labels else counter).inc(delta)
+
+
+def _sample(deltas: _Deltas) -> None:
+    for pool, stats in pool_stats().items():
+        if "checkouts" not in stats:
+            continue
+        for state in ("checked_out", "idle", "overflow"):
+            DB_POOL_CONNECTIONS.labels(pool, state).set(stats[state])
+        deltas.inc(DB_POOL_CHECKOUTS, stats["checkouts"], pool)
+        deltas.inc(DB_POOL_TIMEOUTS, stats["timeouts"], pool)
+        deltas.inc(DB_POOL_WAIT, stats["wait_seconds_total"], pool)
+
+    cache = response_cache.stats(limit=0)
+    if cache.get("backend") == "memory":
+        deltas.inc(CACHE_LOOKUPS, cache["hits"], "hit")
+        deltas.inc(CACHE_LOOKUPS, cache["misses"], "miss")
+        deltas.inc(CACHE_EVICTIONS, cache["evictions"])
+        CACHE_BYTES.set(cache["bytes"])
+        CACHE_ENTRIES.set(cache["entries"])
+
+    for name, stats in bulkhead_stats().items():
+        BULKHEAD_ACTIVE.labels(name).set(stats["active"])
+        BULKHEAD_WAITING.labels(name).set(stats["waiting"])
+        deltas.inc(BULKHEAD_REJECTED, stats["rejected"], name)
+
+
+async def run_sampler(interval: float) -> None:
+    deltas = _Deltas()
+    while True:
+        try:
+            _sample(deltas)
+        except Exception:
+            logger.exception("Metrics sampling failed")
+        await asyncio.sleep(interval)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
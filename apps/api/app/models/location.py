@@ -51,5 +51,6 @@ class RestaurantLocation(Base):
 
     __table_args__ = (
         Index("ix_location_state_city", "state", "city"),
+        Index("ix_location_zip", "zip"),
         Index("ix_location_search_vector", "search_vector", postgresql_using="gin"),
     )
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -14,13 +14,22 @@ class Menu(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    restaurant_location_id: Mapped[uuid.UUID] = mapped_column(
+    # NULL for templates, which are shared by location menus via template_id.
+    restaurant_location_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("restaurant_locations.id", ondelete="CASCADE"),
-        nullable=False,
+        nullable=True,
     )
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, server_default="true")
+    is_template: Mapped[bool] = mapped_column(Boolean, server_default="false")
+    template_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("menus.id", ondelete="RESTRICT"),
+        nullable=True,
+    )
+    # Per-location delta over the template; see app.schemas.menu.MenuOverrides.
+    overrides: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -28,7 +37,8 @@ class Menu(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
-    location: Mapped["RestaurantLocation"] = relationship(back_populates="menus")
+    location: Mapped["RestaurantLocation | None"] = relationship(back_populates="menus")
+    template: Mapped["Menu | None"] = relationship(remote_side=[id])
     categories: Mapped[list["MenuCategory"]] = relationship(
         back_populates="menu",
         cascade="all, delete-orphan",
@@ -24,6 +24,8 @@ class Restaurant(Base):
     user_rating_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
     price_level: Mapped[str | None] = mapped_column(String(50), nullable=True)
     google_maps_uri: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Hash of the imported restaurant and location fields (see scripts.import_restaurants).
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     has_online_ordering: Mapped[bool] = mapped_column(Boolean, server_default="false")
     has_ai_phone: Mapped[bool] = mapped_column(Boolean, server_default="false")
     is_claimed: Mapped[bool] = mapped_column(Boolean, server_default="false")
@@ -0,0 +1,162 @@
+"""
+Per-request SQL instrumentation.
+
+`QueryStatsMiddleware` opens a `QueryStats` for every HTTP request in a
+context variable; cursor events on each engine (see `instrument_engine`)
+add to it. Each response then carries a `Server-Timing` header with the
+statement count and total database time, and a log line records the full
+breakdown. The line is logged as a warning when a request runs too many
+statements, or repeats one statement often enough to suggest an N+1.
+"""
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_START_KEY = "query_stats_started"
+# Set on an execution context while its start time is on the stack.
+_PENDING_ATTR = "_query_stats_pending"
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        # Bound parameters are placeholders, so equal text means one query
+        # shape executed repeatedly.
+        self.statements[statement] += 1
+        if elapsed >= self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        common = self.statements.most_common(1)
+        return common[0] if common else None
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+    if context is not None:
+        setattr(context, _PENDING_ATTR, True)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info[_START_KEY].pop()
+    if context is not None:
+        setattr(context, _PENDING_ATTR, False)
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def _handle_error(context) -> None:
+    # Failed statements never reach after_cursor_execute, so drop their start
+    # time here. Errors raised before the cursor ran (connect, compile) pushed
+    # nothing, and popping would steal another statement's start time.
+    execution = context.execution_context
+    if context.connection is None or not getattr(execution, _PENDING_ATTR, False):
+        return
+    setattr(execution, _PENDING_ATTR, False)
+    starts = context.connection.info.get(_START_KEY)
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    # Listeners run in the request's context: SQLAlchemy's greenlet bridge
+    # carries the caller's contextvars into the sync driver calls.
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+def _short(statement: str | None, limit: int = 200) -> str | None:
+    if statement is None:
+        return None
+    flat = " ".join(statement.split())
+    return flat if len(flat) <= limit else f"{flat[:limit]}..."
+
+
+def server_timing(stats: QueryStats) -> str:
+    return f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries"'
+
+
+class QueryStatsMiddleware:
+    """Report statement count and database time for each HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.server_timing_enabled:
+                    MutableHeaders(scope=message).append("Server-Timing", server_timing(stats))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            _log_request(scope, status, stats, time.perf_counter() - started)
+
+
+def _log_request(scope: Scope, status: int, stats: QueryStats, elapsed: float) -> None:
+    route = scope.get("route")
+    repeated = stats.most_repeated()
+    fields = {
+        "method": scope["method"],
+        "route": getattr(route, "path", scope["path"]),
+        "status": status,
+        "duration_ms": round(elapsed * 1000, 1),
+        "queries": stats.count,
+        "db_ms": round(stats.total_seconds * 1000, 1),
+        "slowest_ms": round(stats.slowest_seconds * 1000, 1),
+        "slowest_statement": _short(stats.slowest_statement),
+    }
+
+    suspect = stats.count >= settings.query_count_warning or (
+        repeated is not None and repeated[1] >= settings.query_repeat_warning
+    )
+    if suspect:
+        fields["repeated_statement"] = _short(repeated[0])
+        fields["repeated_count"] = repeated[1]
+        logger.warning("Possible N+1 query pattern %s", fields, extra={"query_stats": fields})
+    elif stats.count:
+        logger.info("Request query stats %s", fields, extra={"query_stats": fields})
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_admin_db
 from app.schemas.admin import LeadsResponse
 from app.schemas.common import PaginationParams
 from app.services.admin import get_leads, get_leads_for_csv
@@ -21,7 +21,7 @@ async def list_leads(
     sort_dir: Literal["asc", "desc"] = Query(default="desc"),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=50, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_admin_db),
 ):
     pagination = PaginationParams(page=page, page_size=page_size)
     return await get_leads(db, pagination, state_filter=state, sort_by=sort_by, sort_dir=sort_dir)
@@ -32,7 +32,7 @@ async def export_leads_csv(
     state: str | None = Query(default=None),
     sort_by: Literal["lead_score", "name", "state", "estimated_monthly_spend", "rating"] = Query(default="lead_score"),
     sort_dir: Literal["asc", "desc"] = Query(default="desc"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_admin_db),
 ):
     leads = await get_leads_for_csv(db, state_filter=state, sort_by=sort_by, sort_dir=sort_dir)
 
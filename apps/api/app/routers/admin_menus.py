@@ -2,10 +2,15 @@ from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.database import get_db
-from app.schemas.menu import MenuOut, MenuUpsert
+from app.database import get_admin_db
+from app.schemas.menu import MenuCloneOut, MenuCloneRequest, MenuOut, MenuOverrides, MenuUpsert
 from app.schemas.restaurant import RestaurantDetail, RestaurantTemplateUpdate
-from app.services.menu import get_menu_for_restaurant, upsert_menu_for_restaurant
+from app.services.menu import (
+    clone_menu,
+    get_menu_for_restaurant,
+    set_menu_overrides,
+    upsert_menu_for_restaurant,
+)
 from app.services.restaurant import set_restaurant_template
 
 router = APIRouter(prefix="/admin/menus", tags=["admin"])
@@ -21,7 +26,7 @@ async def get_menu_admin(
     state: str,
     city: str,
     restaurant_slug: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_admin_db),
     _: None = Depends(require_admin),
 ):
     menu = await get_menu_for_restaurant(db, state, city, restaurant_slug)
@@ -36,7 +41,7 @@ async def upsert_menu_admin(
     city: str,
     restaurant_slug: str,
     payload: MenuUpsert,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_admin_db),
     _: None = Depends(require_admin),
 ):
     try:
@@ -45,13 +50,49 @@ async def upsert_menu_admin(
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
+@router.put("/{state}/{city}/{restaurant_slug}/overrides", response_model=MenuOut)
+async def set_overrides_admin(
+    state: str,
+    city: str,
+    restaurant_slug: str,
+    payload: MenuOverrides,
+    db: AsyncSession = Depends(get_admin_db),
+    _: None = Depends(require_admin),
+):
+    try:
+        return await set_menu_overrides(db, state, city, restaurant_slug, payload)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.post("/{state}/{city}/{restaurant_slug}/clone", response_model=MenuCloneOut)
+async def clone_menu_admin(
+    state: str,
+    city: str,
+    restaurant_slug: str,
+    payload: MenuCloneRequest,
+    db: AsyncSession = Depends(get_admin_db),
+    _: None = Depends(require_admin),
+):
+    try:
+        return await clone_menu(
+            db, state, city, restaurant_slug, payload.location_ids, chain=payload.chain
+        )
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
 @router.put("/{state}/{city}/{restaurant_slug}/template", response_model=RestaurantDetail)
 async def set_template_admin(
     state: str,
     city: str,
     restaurant_slug: str,
     payload: RestaurantTemplateUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_admin_db),
     _: None = Depends(require_admin),
 ):
     try:
@@ -1,17 +1,25 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_read_db
 from app.schemas.browse import CityOut, StateOut
 from app.schemas.common import PaginatedResponse, PaginationParams
 from app.schemas.restaurant import RestaurantListItem
-from app.services.browse import list_cities, list_restaurants_in_city, list_states
+from app.serialization import json_response
+from app.services.browse import (
+    list_cities,
+    list_cities_json,
+    list_restaurants_in_city,
+    list_restaurants_in_city_json,
+    list_states,
+)
 
 router = APIRouter(prefix="/browse", tags=["browse"])
 
 
 @router.get("/states", response_model=list[StateOut])
-async def get_states(db: AsyncSession = Depends(get_db)):
+async def get_states(db: AsyncSession = Depends(get_read_db, scope="function")):
     return await list_states(db)
 
 
@@ -20,9 +28,11 @@ async def get_cities(
     state: str,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     pagination = PaginationParams(page=page, page_size=page_size)
+    if settings.fast_json:
+        return json_response(await list_cities_json(db, state, pagination))
     return await list_cities(db, state, pagination)
 
 
@@ -35,7 +45,11 @@ async def get_restaurants(
     city: str,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     pagination = PaginationParams(page=page, page_size=page_size)
+    if settings.fast_json:
+        return json_response(
+            await list_restaurants_in_city_json(db, state, city, pagination)
+        )
     return await list_restaurants_in_city(db, state, city, pagination)
@@ -1,4 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query, Response
+
+from app.bulkhead import bulkhead_stats
+from app.cache import response_cache
+from app.config import settings
+from app.database import pool_stats
+from app.invalidation import invalidation_listener
+from app.metrics import render_metrics
+from app.singleflight import single_flight
 
 router = APIRouter()
 
@@ -6,3 +14,29 @@ router = APIRouter()
 @router.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@router.get("/health/db")
+async def db_stats():
+    return {"pools": pool_stats(), "bulkheads": bulkhead_stats()}
+
+
+@router.get("/health/cache")
+async def cache_stats(limit: int = Query(default=50, ge=0, le=1000)):
+    stats = response_cache.stats(limit=limit)
+    if settings.cache_bus_enabled:
+        stats["bus"] = invalidation_listener.stats()
+    return stats
+
+
+@router.get("/health/singleflight")
+async def singleflight_stats(limit: int = Query(default=50, ge=0, le=1000)):
+    return single_flight.stats(limit=limit)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
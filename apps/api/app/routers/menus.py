@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.config import settings
+from app.database import get_read_db
 from app.schemas.menu import MenuOut
-from app.services.menu import get_menu_for_restaurant
+from app.serialization import json_response
+from app.services.menu import get_menu_for_restaurant, get_menu_json, get_menu_version
 
 router = APIRouter(prefix="/menus", tags=["menus"])
 
@@ -13,9 +21,26 @@ async def get_menu(
     state: str,
     city: str,
     restaurant_slug: str,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
+    version = await get_menu_version(db, state, city, restaurant_slug)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Menu not found")
+
+    headers = validator_headers(make_etag(version.id, version.updated_at), version.updated_at)
+    if is_not_modified(request, headers["ETag"], version.updated_at):
+        return not_modified_response(headers)
+
+    if settings.fast_json:
+        body = await get_menu_json(db, state, city, restaurant_slug)
+        if body is None:
+            raise HTTPException(status_code=404, detail="Menu not found")
+        return json_response(body, headers)
+
     menu = await get_menu_for_restaurant(db, state, city, restaurant_slug)
     if menu is None:
         raise HTTPException(status_code=404, detail="Menu not found")
+    response.headers.update(headers)
     return menu
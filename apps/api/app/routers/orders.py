@@ -3,7 +3,8 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_order_db
+from app.metrics import ORDER_FAILURES, ORDERS_CREATED
 from app.schemas.order import OrderCreate, OrderOut
 from app.services.order import create_order, get_order
 
@@ -16,18 +17,22 @@ async def create_restaurant_order(
     city: str,
     restaurant_slug: str,
     payload: OrderCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_order_db),
 ):
     try:
-        return await create_order(db, state, city, restaurant_slug, payload)
+        order = await create_order(db, state, city, restaurant_slug, payload)
     except LookupError as exc:
+        ORDER_FAILURES.labels("not_found").inc()
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except ValueError as exc:
+        ORDER_FAILURES.labels("invalid").inc()
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    ORDERS_CREATED.inc()
+    return order
 
 
 @router.get("/{order_id}", response_model=OrderOut)
-async def get_order_detail(order_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_order_detail(order_id: UUID, db: AsyncSession = Depends(get_order_db)):
     order = await get_order(db, order_id)
     if order is None:
         raise HTTPException(status_code=404, detail="Order not found")
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.database import get_read_db
 from app.schemas.restaurant import RestaurantDetail
-from app.services.restaurant import get_restaurant_detail
+from app.services.restaurant import get_restaurant_detail, get_restaurant_version
 
 router = APIRouter(prefix="/restaurants", tags=["restaurants"])
 
@@ -16,9 +22,23 @@ async def get_restaurant(
     state: str,
     city: str,
     restaurant_slug: str,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
+    version = await get_restaurant_version(db, state, city, restaurant_slug)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+
+    headers = validator_headers(
+        make_etag(version.restaurant_location_id, version.is_canonical, version.updated_at),
+        version.updated_at,
+    )
+    if is_not_modified(request, headers["ETag"], version.updated_at):
+        return not_modified_response(headers)
+
     detail = await get_restaurant_detail(db, state, city, restaurant_slug)
     if detail is None:
         raise HTTPException(status_code=404, detail="Restaurant not found")
+    response.headers.update(headers)
     return detail
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_read_db
 from app.schemas.common import PaginatedResponse, PaginationParams
 from app.schemas.restaurant import SearchResultItem
 from app.services.search import search_restaurants
+from app.services.search_index import search_index
+from app.services.zip_search import MAX_RADIUS_MILES, parse_zip, search_by_zip
 
 router = APIRouter(tags=["search"])
 
@@ -14,13 +17,27 @@ async def search(
     q: str = Query(default="", max_length=200),
     state: str | None = Query(default=None),
     city: str | None = Query(default=None),
+    radius_miles: float = Query(
+        default=0,
+        ge=0,
+        le=MAX_RADIUS_MILES,
+        description="Widen zip code searches to neighbouring zips within this radius",
+    ),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
     if not q.strip():
         return PaginatedResponse(
             items=[], total=0, page=page, page_size=page_size, total_pages=0
         )
     pagination = PaginationParams(page=page, page_size=page_size)
+    zip_code = parse_zip(q)
+    if zip_code:
+        return await search_by_zip(
+            db, zip_code, pagination, radius_miles=radius_miles, state=state, city=city
+        )
+    # Until the first build finishes the in-memory backend defers to Postgres.
+    if settings.search_backend == "memory" and search_index.ready:
+        return search_index.search(q, pagination, state=state, city=city)
     return await search_restaurants(db, q, pagination, state=state, city=city)
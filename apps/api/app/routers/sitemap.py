@@ -1,12 +1,41 @@
-from fastapi import APIRouter, Depends
+import gzip
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.services.restaurant import get_all_slugs
+from app.database import get_read_db
+from app.services.sitemap import get_sitemap_snapshot
+
+router = APIRouter(prefix="/sitemap", tags=["sitemap"])
+
+
+def _xml_response(request: Request, body: bytes) -> Response:
+    """Serve precompressed bytes as-is when the client accepts gzip."""
+    headers = {"Cache-Control": "public, max-age=3600", "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body = gzip.decompress(body)
+    return Response(content=body, media_type="application/xml", headers=headers)
+
+
+@router.get("/index.xml")
+async def sitemap_index(request: Request, db: AsyncSession = Depends(get_read_db, scope="function")):
+    snapshot = await get_sitemap_snapshot(db)
+    return _xml_response(request, snapshot.index)
+
 
-router = APIRouter(tags=["sitemap"])
+@router.get("/directory.xml")
+async def sitemap_directory(request: Request, db: AsyncSession = Depends(get_read_db, scope="function")):
+    snapshot = await get_sitemap_snapshot(db)
+    return _xml_response(request, snapshot.directory)
 
 
-@router.get("/sitemap/slugs")
-async def sitemap_slugs(db: AsyncSession = Depends(get_db)):
-    return await get_all_slugs(db)
+@router.get("/restaurants-{shard}.xml")
+async def sitemap_restaurants(
+    shard: int, request: Request, db: AsyncSession = Depends(get_read_db, scope="function")
+):
+    snapshot = await get_sitemap_snapshot(db)
+    if shard < 0 or shard >= len(snapshot.shards):
+        raise HTTPException(status_code=404, detail="Sitemap shard not found")
+    return _xml_response(request, snapshot.shards[shard])
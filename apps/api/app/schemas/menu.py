@@ -1,6 +1,6 @@
 import uuid
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, NonNegativeInt
 
 
 class ModifierOptionOut(BaseModel):
@@ -78,3 +78,34 @@ class MenuUpsert(BaseModel):
     name: str
     is_active: bool = True
     categories: list[MenuCategoryIn]
+
+
+class MenuOverrides(BaseModel):
+    """A location's delta over its menu template, keyed by template row ids."""
+
+    item_prices: dict[uuid.UUID, NonNegativeInt] = Field(default_factory=dict)
+    option_prices: dict[uuid.UUID, NonNegativeInt] = Field(default_factory=dict)
+    hidden_items: set[uuid.UUID] = Field(default_factory=set)
+    hidden_categories: set[uuid.UUID] = Field(default_factory=set)
+
+    def item_price(self, item_id: uuid.UUID, price_cents: int) -> int:
+        return self.item_prices.get(item_id, price_cents)
+
+    def option_price(self, option_id: uuid.UUID, price_cents: int) -> int:
+        return self.option_prices.get(option_id, price_cents)
+
+
+class MenuCloneRequest(BaseModel):
+    location_ids: list[uuid.UUID] = Field(default_factory=list)
+    # Also every other location of the source location's restaurant.
+    chain: bool = False
+
+
+class ClonedMenu(BaseModel):
+    restaurant_location_id: uuid.UUID
+    menu_id: uuid.UUID
+
+
+class MenuCloneOut(BaseModel):
+    source_menu_id: uuid.UUID
+    menus: list[ClonedMenu]
@@ -72,5 +72,6 @@ class SearchResultItem(BaseModel):
     city_slug: str
     restaurant_slug: str
     rank: float
+    distance_miles: float | None = None
 
     model_config = {"from_attributes": True}
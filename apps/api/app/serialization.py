@@ -0,0 +1,32 @@
+"""
+Opt-in fast JSON path for hot GET endpoints (`settings.fast_json`).
+
+Services normally build pydantic response models, which FastAPI then checks
+against `response_model` and encodes. On the fast path, trusted database
+rows are shaped into plain dicts and encoded once by pydantic-core, and the
+bytes themselves are cached, so a cache hit does no serialization work.
+Pydantic models are not constructed at all on this path; per-object model
+construction (validated or `model_construct`) dominates the cost of large
+responses such as menus.
+"""
+
+from typing import Any
+
+from fastapi import Response
+from pydantic_core import to_json
+
+# Suffix for cache keys holding pre-encoded JSON next to the model entry.
+JSON_KEY_SUFFIX = "#json"
+
+
+def json_key(key: str) -> str:
+    return f"{key}{JSON_KEY_SUFFIX}"
+
+
+def encode_json(value: Any) -> bytes:
+    """Encode dicts, lists and models (UUIDs, datetimes included) to JSON bytes."""
+    return to_json(value)
+
+
+def json_response(body: bytes, headers: dict[str, str] | None = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -3,13 +3,27 @@ import math
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import (
+    STATES_KEY,
+    cities_key,
+    city_restaurants_key,
+    response_cache,
+)
+from app.database import is_pinned_primary
 from app.models import Restaurant, RestaurantLocation, RestaurantSlug
 from app.schemas.browse import CityOut, StateOut
 from app.schemas.common import PaginatedResponse, PaginationParams
 from app.schemas.restaurant import RestaurantListItem
+from app.serialization import encode_json, json_key
 
 
 async def list_states(db: AsyncSession) -> list[StateOut]:
+    # A client that just wrote must not be served a pre-write page.
+    if not is_pinned_primary(db):
+        cached = response_cache.get(STATES_KEY)
+        if cached is not None:
+            return cached
+
     result = await db.execute(
         select(
             RestaurantLocation.state,
@@ -18,15 +32,25 @@ async def list_states(db: AsyncSession) -> list[StateOut]:
         .group_by(RestaurantLocation.state)
         .order_by(RestaurantLocation.state)
     )
-    return [
+    states = [
         StateOut(state=row.state, restaurant_count=row.restaurant_count)
         for row in result.all()
     ]
+    response_cache.set(STATES_KEY, states)
+    return states
 
 
-async def list_cities(
-    db: AsyncSession, state: str, pagination: PaginationParams
-) -> PaginatedResponse[CityOut]:
+def _page(items: list, total: int, pagination: PaginationParams) -> dict:
+    return {
+        "items": items,
+        "total": total,
+        "page": pagination.page,
+        "page_size": pagination.page_size,
+        "total_pages": math.ceil(total / pagination.page_size) if total > 0 else 0,
+    }
+
+
+async def _cities_page(db: AsyncSession, state: str, pagination: PaginationParams) -> dict:
     base = (
         select(
             RestaurantLocation.city,
@@ -49,42 +73,55 @@ async def list_cities(
     )
     total = count_result.scalar() or 0
 
-    # Paginate
+    # Paginate; columns are selected in CityOut field order.
     result = await db.execute(
         base.offset(pagination.offset).limit(pagination.page_size)
     )
-    items = [
-        CityOut(
-            city=row.city,
-            city_slug=row.city_slug,
-            state=row.state,
-            restaurant_count=row.restaurant_count,
-        )
-        for row in result.all()
-    ]
+    return _page([row._asdict() for row in result.all()], total, pagination)
 
-    return PaginatedResponse(
-        items=items,
-        total=total,
-        page=pagination.page,
-        page_size=pagination.page_size,
-        total_pages=math.ceil(total / pagination.page_size) if total > 0 else 0,
+
+async def list_cities(
+    db: AsyncSession, state: str, pagination: PaginationParams
+) -> PaginatedResponse[CityOut]:
+    cache_key = cities_key(state, pagination.page, pagination.page_size)
+    if not is_pinned_primary(db):
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    response = PaginatedResponse[CityOut].model_validate(
+        await _cities_page(db, state, pagination)
     )
+    response_cache.set(cache_key, response)
+    return response
 
 
-async def list_restaurants_in_city(
+async def list_cities_json(
+    db: AsyncSession, state: str, pagination: PaginationParams
+) -> bytes:
+    """Fast-path variant of list_cities returning encoded JSON."""
+    cache_key = json_key(cities_key(state, pagination.page, pagination.page_size))
+    if not is_pinned_primary(db):
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    body = encode_json(await _cities_page(db, state, pagination))
+    response_cache.set(cache_key, body)
+    return body
+
+
+async def _city_restaurants_page(
     db: AsyncSession,
     state_slug: str,
     city_slug: str,
     pagination: PaginationParams,
-) -> PaginatedResponse[RestaurantListItem]:
+) -> dict:
+    # Columns are selected in RestaurantListItem field order.
     base = (
         select(
             Restaurant.name,
             Restaurant.phone,
-            Restaurant.rating,
-            Restaurant.user_rating_count,
-            Restaurant.price_level,
             Restaurant.has_online_ordering,
             Restaurant.has_ai_phone,
             Restaurant.is_claimed,
@@ -95,6 +132,9 @@ async def list_restaurants_in_city(
             RestaurantSlug.state_slug,
             RestaurantSlug.city_slug,
             RestaurantSlug.restaurant_slug,
+            Restaurant.rating,
+            Restaurant.user_rating_count,
+            Restaurant.price_level,
         )
         .join(RestaurantLocation, Restaurant.id == RestaurantLocation.restaurant_id)
         .join(RestaurantSlug, RestaurantLocation.id == RestaurantSlug.restaurant_location_id)
@@ -114,31 +154,45 @@ async def list_restaurants_in_city(
     result = await db.execute(
         base.offset(pagination.offset).limit(pagination.page_size)
     )
-    items = [
-        RestaurantListItem(
-            name=row.name,
-            phone=row.phone,
-            has_online_ordering=row.has_online_ordering,
-            has_ai_phone=row.has_ai_phone,
-            is_claimed=row.is_claimed,
-            address1=row.address1,
-            city=row.city,
-            state=row.state,
-            zip=row.zip,
-            state_slug=row.state_slug,
-            city_slug=row.city_slug,
-            restaurant_slug=row.restaurant_slug,
-            rating=row.rating,
-            user_rating_count=row.user_rating_count,
-            price_level=row.price_level,
-        )
-        for row in result.all()
-    ]
+    return _page([row._asdict() for row in result.all()], total, pagination)
 
-    return PaginatedResponse(
-        items=items,
-        total=total,
-        page=pagination.page,
-        page_size=pagination.page_size,
-        total_pages=math.ceil(total / pagination.page_size) if total > 0 else 0,
+
+async def list_restaurants_in_city(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    pagination: PaginationParams,
+) -> PaginatedResponse[RestaurantListItem]:
+    cache_key = city_restaurants_key(
+        state_slug, city_slug, pagination.page, pagination.page_size
+    )
+    if not is_pinned_primary(db):
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    response = PaginatedResponse[RestaurantListItem].model_validate(
+        await _city_restaurants_page(db, state_slug, city_slug, pagination)
     )
+    response_cache.set(cache_key, response)
+    return response
+
+
+async def list_restaurants_in_city_json(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    pagination: PaginationParams,
+) -> bytes:
+    """Fast-path variant of list_restaurants_in_city returning encoded JSON."""
+    cache_key = json_key(
+        city_restaurants_key(state_slug, city_slug, pagination.page, pagination.page_size)
+    )
+    if not is_pinned_primary(db):
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    body = encode_json(await _city_restaurants_page(db, state_slug, city_slug, pagination))
+    response_cache.set(cache_key, body)
+    return body
@@ -1,7 +1,13 @@
-from sqlalchemy import select, update
+import uuid
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
+from app.cache import menu_key, menu_keys, response_cache
+from app.database import is_pinned_primary
+from app.invalidation import publish_invalidation
 from app.models import RestaurantLocation, RestaurantSlug
 from app.models.menu import (
     Menu,
@@ -11,92 +17,110 @@ from app.models.menu import (
     ModifierGroup,
 )
 from app.schemas.menu import (
-    MenuCategoryOut,
-    MenuItemOut,
+    ClonedMenu,
+    MenuCloneOut,
     MenuOut,
+    MenuOverrides,
     MenuUpsert,
-    ModifierGroupOut,
-    ModifierOptionOut,
 )
+from app.serialization import encode_json, json_key
+from app.singleflight import single_flight
 
 
-def _build_menu_out(menu: Menu) -> MenuOut:
-    categories: list[MenuCategoryOut] = []
+_NO_OVERRIDES = MenuOverrides()
+
+
+def menu_overrides(menu: Menu) -> MenuOverrides:
+    if not menu.overrides:
+        return _NO_OVERRIDES
+    return MenuOverrides.model_validate(menu.overrides)
+
 
-    for category in menu.categories:
-        if not category.is_active:
+def _menu_dict(menu: Menu) -> dict:
+    """Active categories and items of a loaded menu, shaped like MenuOut.
+
+    A menu backed by a template has no tree of its own: it is materialized
+    from the template's tree with the location's overrides applied.
+    """
+    source = menu.template if menu.template_id is not None else menu
+    overrides = menu_overrides(menu)
+    categories: list[dict] = []
+
+    for category in source.categories:
+        if not category.is_active or category.id in overrides.hidden_categories:
             continue
 
-        items: list[MenuItemOut] = []
+        items: list[dict] = []
         for item in category.items:
-            if not item.is_active:
+            if not item.is_active or item.id in overrides.hidden_items:
                 continue
 
-            groups: list[ModifierGroupOut] = []
+            groups: list[dict] = []
             for link in item.modifier_group_links:
                 group = link.modifier_group
                 options = [
-                    ModifierOptionOut(
-                        id=option.id,
-                        name=option.name,
-                        price_cents=option.price_cents,
-                        is_default=option.is_default,
-                        sort_order=option.sort_order,
-                    )
+                    {
+                        "id": option.id,
+                        "name": option.name,
+                        "price_cents": overrides.option_price(option.id, option.price_cents),
+                        "is_default": option.is_default,
+                        "sort_order": option.sort_order,
+                    }
                     for option in group.options
                 ]
                 groups.append(
-                    ModifierGroupOut(
-                        id=group.id,
-                        name=group.name,
-                        description=group.description,
-                        min_select=group.min_select,
-                        max_select=group.max_select,
-                        is_required=group.is_required,
-                        sort_order=group.sort_order,
-                        options=options,
-                    )
+                    {
+                        "id": group.id,
+                        "name": group.name,
+                        "description": group.description,
+                        "min_select": group.min_select,
+                        "max_select": group.max_select,
+                        "is_required": group.is_required,
+                        "sort_order": group.sort_order,
+                        "options": options,
+                    }
                 )
 
             items.append(
-                MenuItemOut(
-                    id=item.id,
-                    name=item.name,
-                    description=item.description,
-                    price_cents=item.price_cents,
-                    sort_order=item.sort_order,
-                    is_active=item.is_active,
-                    modifier_groups=groups,
-                )
+                {
+                    "id": item.id,
+                    "name": item.name,
+                    "description": item.description,
+                    "price_cents": overrides.item_price(item.id, item.price_cents),
+                    "sort_order": item.sort_order,
+                    "is_active": item.is_active,
+                    "modifier_groups": groups,
+                }
             )
 
         categories.append(
-            MenuCategoryOut(
-                id=category.id,
-                name=category.name,
-                description=category.description,
-                sort_order=category.sort_order,
-                is_active=category.is_active,
-                items=items,
-            )
+            {
+                "id": category.id,
+                "name": category.name,
+                "description": category.description,
+                "sort_order": category.sort_order,
+                "is_active": category.is_active,
+                "items": items,
+            }
         )
 
-    return MenuOut(
-        id=menu.id,
-        name=menu.name,
-        is_active=menu.is_active,
-        categories=categories,
-    )
+    return {
+        "id": menu.id,
+        "name": menu.name,
+        "is_active": menu.is_active,
+        "categories": categories,
+    }
 
 
-async def get_menu_for_restaurant(
-    db: AsyncSession,
-    state_slug: str,
-    city_slug: str,
-    restaurant_slug: str,
-) -> MenuOut | None:
-    query = (
-        select(Menu)
+def _build_menu_out(menu: Menu) -> MenuOut:
+    # One validation pass over the whole tree is cheaper than building each
+    # nested model separately.
+    return MenuOut.model_validate(_menu_dict(menu))
+
+
+def _active_menu_query(state_slug: str, city_slug: str, restaurant_slug: str, *columns):
+    return (
+        select(*columns)
         .join(RestaurantLocation, Menu.restaurant_location_id == RestaurantLocation.id)
         .join(
             RestaurantSlug,
@@ -109,29 +133,157 @@ async def get_menu_for_restaurant(
             Menu.is_active.is_(True),
         )
         .order_by(Menu.created_at.desc())
-        .options(
-            selectinload(Menu.categories)
-            .selectinload(MenuCategory.items)
-            .selectinload(MenuItem.modifier_group_links)
-            .selectinload(MenuItemModifierGroup.modifier_group)
-            .selectinload(ModifierGroup.options)
+    )
+
+
+async def get_menu_version(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+) -> Row | None:
+    """Cheap validator lookup for conditional GETs of the active menu.
+
+    Menu edits always write a new menu row, and override edits touch
+    `updated_at`, so the id and the later of the menu's and its template's
+    `updated_at` identify its content.
+    """
+    if is_pinned_primary(db):
+        return await _load_menu_version(db, state_slug, city_slug, restaurant_slug)
+    return await single_flight.do(
+        f"{menu_key(state_slug, city_slug, restaurant_slug)}#version",
+        lambda: _load_menu_version(db, state_slug, city_slug, restaurant_slug),
+    )
+
+
+async def _load_menu_version(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+) -> Row | None:
+    template = aliased(Menu)
+    result = await db.execute(
+        _active_menu_query(
+            state_slug,
+            city_slug,
+            restaurant_slug,
+            Menu.id,
+            # greatest() skips the NULL of a menu without a template.
+            func.greatest(Menu.updated_at, template.updated_at).label("updated_at"),
         )
+        .outerjoin(template, template.id == Menu.template_id)
+        .limit(1)
+    )
+    return result.first()
+
+
+async def get_menu_for_restaurant(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+) -> MenuOut | None:
+    cache_key = menu_key(state_slug, city_slug, restaurant_slug)
+    if is_pinned_primary(db):
+        # Fresh read for a client that just wrote; it still refreshes the cache.
+        return await _load_menu(db, state_slug, city_slug, restaurant_slug, cache_key)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    # Concurrent misses for the same menu share one load.
+    return await single_flight.do(
+        cache_key,
+        lambda: _load_menu(db, state_slug, city_slug, restaurant_slug, cache_key),
+    )
+
+
+async def get_menu_json(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+) -> bytes | None:
+    """Fast-path variant of get_menu_for_restaurant returning encoded JSON."""
+    cache_key = json_key(menu_key(state_slug, city_slug, restaurant_slug))
+    if is_pinned_primary(db):
+        return await _load_menu_json(db, state_slug, city_slug, restaurant_slug, cache_key)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    return await single_flight.do(
+        cache_key,
+        lambda: _load_menu_json(db, state_slug, city_slug, restaurant_slug, cache_key),
+    )
+
+
+def _tree_options(path):
+    return (
+        path.selectinload(MenuCategory.items)
+        .selectinload(MenuItem.modifier_group_links)
+        .selectinload(MenuItemModifierGroup.modifier_group)
+        .selectinload(ModifierGroup.options)
+    )
+
+
+def _menu_tree_options() -> list:
+    """Load a menu's own tree, or its template's when it has one."""
+    return [
+        _tree_options(selectinload(Menu.categories)),
+        _tree_options(selectinload(Menu.template).selectinload(Menu.categories)),
+    ]
+
+
+async def _fetch_active_menu(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+) -> Menu | None:
+    query = _active_menu_query(state_slug, city_slug, restaurant_slug, Menu).options(
+        *_menu_tree_options()
     )
 
     result = await db.execute(query)
-    menu = result.scalars().unique().first()
+    return result.scalars().unique().first()
+
+
+async def _load_menu(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+    cache_key: str,
+) -> MenuOut | None:
+    menu = await _fetch_active_menu(db, state_slug, city_slug, restaurant_slug)
     if menu is None:
         return None
-    return _build_menu_out(menu)
+    menu_out = _build_menu_out(menu)
+    response_cache.set(cache_key, menu_out)
+    return menu_out
 
 
-async def upsert_menu_for_restaurant(
+async def _load_menu_json(
     db: AsyncSession,
     state_slug: str,
     city_slug: str,
     restaurant_slug: str,
-    payload: MenuUpsert,
-) -> MenuOut:
+    cache_key: str,
+) -> bytes | None:
+    menu = await _fetch_active_menu(db, state_slug, city_slug, restaurant_slug)
+    if menu is None:
+        return None
+    body = encode_json(_menu_dict(menu))
+    response_cache.set(cache_key, body)
+    return body
+
+
+async def _canonical_location_id(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+) -> uuid.UUID:
     location_result = await db.execute(
         select(RestaurantLocation.id)
         .join(
@@ -148,48 +300,301 @@ async def upsert_menu_for_restaurant(
     location_id = location_result.scalar_one_or_none()
     if location_id is None:
         raise LookupError("Restaurant not found.")
+    return location_id
 
-    async with db.begin():
-        await db.execute(
-            update(Menu)
-            .where(
-                Menu.restaurant_location_id == location_id,
-                Menu.is_active.is_(True),
-            )
-            .values(is_active=False)
+
+async def _location_menu_keys(db: AsyncSession, location_ids: list[uuid.UUID]) -> list[str]:
+    """Menu cache keys under every slug of the locations, aliases included."""
+    slugs = await db.execute(
+        select(
+            RestaurantSlug.state_slug, RestaurantSlug.city_slug, RestaurantSlug.restaurant_slug
+        ).where(RestaurantSlug.restaurant_location_id.in_(location_ids))
+    )
+    return [key for slug in slugs.all() for key in menu_keys(*slug)]
+
+
+async def upsert_menu_for_restaurant(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+    payload: MenuUpsert,
+) -> MenuOut:
+    location_id = await _canonical_location_id(db, state_slug, city_slug, restaurant_slug)
+
+    cache_keys = await _location_menu_keys(db, [location_id])
+    await db.execute(
+        update(Menu)
+        .where(
+            Menu.restaurant_location_id == location_id,
+            Menu.is_active.is_(True),
         )
+        .values(is_active=False)
+    )
+
+    menu = Menu(
+        restaurant_location_id=location_id,
+        name=payload.name,
+        is_active=payload.is_active,
+    )
+    db.add(menu)
+    await db.flush()
 
-        menu = Menu(
-            restaurant_location_id=location_id,
-            name=payload.name,
-            is_active=payload.is_active,
+    for cat_index, category in enumerate(payload.categories):
+        cat_order = category.sort_order if category.sort_order is not None else cat_index
+        menu_category = MenuCategory(
+            menu_id=menu.id,
+            name=category.name,
+            description=category.description,
+            sort_order=cat_order,
+            is_active=category.is_active,
         )
-        db.add(menu)
+        db.add(menu_category)
         await db.flush()
 
-        for cat_index, category in enumerate(payload.categories):
-            cat_order = category.sort_order if category.sort_order is not None else cat_index
-            menu_category = MenuCategory(
-                menu_id=menu.id,
-                name=category.name,
-                description=category.description,
-                sort_order=cat_order,
-                is_active=category.is_active,
-            )
-            db.add(menu_category)
-            await db.flush()
-
-            for item_index, item in enumerate(category.items):
-                item_order = item.sort_order if item.sort_order is not None else item_index
-                db.add(
-                    MenuItem(
-                        menu_category_id=menu_category.id,
-                        name=item.name,
-                        description=item.description,
-                        price_cents=item.price_cents,
-                        sort_order=item_order,
-                        is_active=item.is_active,
-                    )
+        for item_index, item in enumerate(category.items):
+            item_order = item.sort_order if item.sort_order is not None else item_index
+            db.add(
+                MenuItem(
+                    menu_category_id=menu_category.id,
+                    name=item.name,
+                    description=item.description,
+                    price_cents=item.price_cents,
+                    sort_order=item_order,
+                    is_active=item.is_active,
                 )
+            )
+
+    await publish_invalidation(db, keys=cache_keys)
+    await db.commit()
+
+    # Drop our own copy now; other workers follow once the NOTIFY arrives.
+    response_cache.invalidate(*cache_keys)
+    result = await db.execute(
+        select(Menu).where(Menu.id == menu.id).options(*_menu_tree_options())
+    )
+    return _build_menu_out(result.scalar_one())
+
+
+def _template_row_ids(template: Menu) -> tuple[set, set, set]:
+    """(category, item, option) ids of a loaded template tree."""
+    category_ids, item_ids, option_ids = set(), set(), set()
+    for category in template.categories:
+        category_ids.add(category.id)
+        for item in category.items:
+            item_ids.add(item.id)
+            for link in item.modifier_group_links:
+                option_ids.update(option.id for option in link.modifier_group.options)
+    return category_ids, item_ids, option_ids
+
+
+async def set_menu_overrides(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+    overrides: MenuOverrides,
+) -> MenuOut:
+    """Replace the overrides of a template-backed active menu."""
+    location_id = await _canonical_location_id(db, state_slug, city_slug, restaurant_slug)
+
+    result = await db.execute(
+        select(Menu)
+        .where(Menu.restaurant_location_id == location_id, Menu.is_active.is_(True))
+        .order_by(Menu.created_at.desc())
+        .limit(1)
+        .options(*_menu_tree_options())
+    )
+    menu = result.scalars().first()
+    if menu is None:
+        raise LookupError("Menu not found.")
+    if menu.template_id is None:
+        raise ValueError("Menu is not based on a template.")
 
+    category_ids, item_ids, option_ids = _template_row_ids(menu.template)
+    if (
+        not overrides.hidden_categories <= category_ids
+        or not overrides.hidden_items | overrides.item_prices.keys() <= item_ids
+        or not overrides.option_prices.keys() <= option_ids
+    ):
+        raise ValueError("Overrides refer to rows that are not in the menu template.")
+
+    cache_keys = await _location_menu_keys(db, [location_id])
+    menu.overrides = overrides.model_dump(mode="json", exclude_defaults=True) or None
+    await db.flush()
+    await publish_invalidation(db, keys=cache_keys)
+    await db.commit()
+
+    response_cache.invalidate(*cache_keys)
     return _build_menu_out(menu)
+
+
+# Each clone gets fresh ids from gen_random_uuid(); the temp tables map every
+# source row to its copy per target location, so children can find their new
+# parents. The work is a fixed number of statements however many targets.
+_CLONE_TABLES = [
+    "CREATE TEMP TABLE clone_menus (location_id uuid, new_id uuid) ON COMMIT DROP",
+    "CREATE TEMP TABLE clone_categories "
+    "(location_id uuid, menu_id uuid, old_id uuid, new_id uuid) ON COMMIT DROP",
+    "CREATE TEMP TABLE clone_items "
+    "(location_id uuid, category_id uuid, old_id uuid, new_id uuid) ON COMMIT DROP",
+    "CREATE TEMP TABLE clone_groups (location_id uuid, old_id uuid, new_id uuid) ON COMMIT DROP",
+]
+
+_CLONE_MENU_ROWS = [
+    """
+    INSERT INTO clone_menus
+    SELECT t.location_id, gen_random_uuid()
+    FROM unnest(CAST(:location_ids AS uuid[])) AS t(location_id)
+    """,
+    """
+    INSERT INTO menus (id, restaurant_location_id, name, is_active, template_id, overrides)
+    SELECT m.new_id, m.location_id, s.name, s.is_active, s.template_id, s.overrides
+    FROM clone_menus m CROSS JOIN menus s
+    WHERE s.id = :source_menu_id
+    """,
+]
+
+_CLONE_TREE = [
+    """
+    INSERT INTO clone_categories
+    SELECT m.location_id, m.new_id, c.id, gen_random_uuid()
+    FROM clone_menus m CROSS JOIN menu_categories c
+    WHERE c.menu_id = :source_menu_id
+    """,
+    """
+    INSERT INTO menu_categories (id, menu_id, name, description, sort_order, is_active)
+    SELECT cc.new_id, cc.menu_id, c.name, c.description, c.sort_order, c.is_active
+    FROM clone_categories cc JOIN menu_categories c ON c.id = cc.old_id
+    """,
+    """
+    INSERT INTO clone_items
+    SELECT cc.location_id, cc.new_id, i.id, gen_random_uuid()
+    FROM clone_categories cc JOIN menu_items i ON i.menu_category_id = cc.old_id
+    """,
+    """
+    INSERT INTO menu_items
+        (id, menu_category_id, name, description, price_cents, sort_order, is_active)
+    SELECT ci.new_id, ci.category_id, i.name, i.description, i.price_cents, i.sort_order,
+        i.is_active
+    FROM clone_items ci JOIN menu_items i ON i.id = ci.old_id
+    """,
+    # A group linked to several items of the menu is copied once per target.
+    """
+    INSERT INTO clone_groups
+    SELECT g.location_id, g.old_id, gen_random_uuid()
+    FROM (
+        SELECT DISTINCT ci.location_id, l.modifier_group_id AS old_id
+        FROM clone_items ci JOIN menu_item_modifier_groups l ON l.menu_item_id = ci.old_id
+    ) g
+    """,
+    """
+    INSERT INTO modifier_groups
+        (id, name, description, min_select, max_select, is_required, sort_order)
+    SELECT cg.new_id, g.name, g.description, g.min_select, g.max_select, g.is_required,
+        g.sort_order
+    FROM clone_groups cg JOIN modifier_groups g ON g.id = cg.old_id
+    """,
+    """
+    INSERT INTO menu_item_modifier_groups (menu_item_id, modifier_group_id, sort_order)
+    SELECT ci.new_id, cg.new_id, l.sort_order
+    FROM clone_items ci
+    JOIN menu_item_modifier_groups l ON l.menu_item_id = ci.old_id
+    JOIN clone_groups cg ON cg.location_id = ci.location_id AND cg.old_id = l.modifier_group_id
+    """,
+    """
+    INSERT INTO modifier_options
+        (id, modifier_group_id, name, price_cents, is_default, sort_order)
+    SELECT gen_random_uuid(), cg.new_id, o.name, o.price_cents, o.is_default, o.sort_order
+    FROM clone_groups cg JOIN modifier_options o ON o.modifier_group_id = cg.old_id
+    """,
+]
+
+
+async def _clone_targets(
+    db: AsyncSession,
+    source_location_id: uuid.UUID,
+    location_ids: list[uuid.UUID],
+    chain: bool,
+) -> list[uuid.UUID]:
+    targets = set(location_ids)
+    missing = targets - set(
+        (
+            await db.execute(
+                select(RestaurantLocation.id).where(RestaurantLocation.id.in_(targets))
+            )
+        ).scalars()
+    )
+    if missing:
+        raise LookupError(f"Unknown locations: {', '.join(sorted(map(str, missing)))}.")
+    if chain:
+        siblings = await db.execute(
+            select(RestaurantLocation.id).where(
+                RestaurantLocation.restaurant_id
+                == select(RestaurantLocation.restaurant_id)
+                .where(RestaurantLocation.id == source_location_id)
+                .scalar_subquery()
+            )
+        )
+        targets.update(siblings.scalars())
+    targets.discard(source_location_id)
+    return sorted(targets)
+
+
+async def clone_menu(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+    location_ids: list[uuid.UUID],
+    chain: bool = False,
+) -> MenuCloneOut:
+    """Copy a location's active menu to other locations in one transaction.
+
+    The copies replace the targets' active menus. A template-backed menu
+    is cloned as its single menu row, sharing the template and overrides.
+    """
+    source_location_id = await _canonical_location_id(
+        db, state_slug, city_slug, restaurant_slug
+    )
+    source = (
+        await db.execute(
+            select(Menu.id, Menu.template_id)
+            .where(Menu.restaurant_location_id == source_location_id, Menu.is_active.is_(True))
+            .order_by(Menu.created_at.desc())
+            .limit(1)
+        )
+    ).first()
+    if source is None:
+        raise LookupError("Menu not found.")
+
+    targets = await _clone_targets(db, source_location_id, location_ids, chain)
+    if not targets:
+        raise ValueError("No target locations to clone to.")
+
+    cache_keys = await _location_menu_keys(db, targets)
+
+    await db.execute(
+        update(Menu)
+        .where(Menu.restaurant_location_id.in_(targets), Menu.is_active.is_(True))
+        .values(is_active=False)
+    )
+    params = {"source_menu_id": source.id, "location_ids": targets}
+    statements = _CLONE_TABLES + _CLONE_MENU_ROWS
+    if source.template_id is None:
+        statements += _CLONE_TREE
+    for statement in statements:
+        await db.execute(text(statement), params)
+    cloned = (await db.execute(text("SELECT location_id, new_id FROM clone_menus"))).all()
+
+    await publish_invalidation(db, keys=cache_keys)
+    await db.commit()
+
+    response_cache.invalidate(*cache_keys)
+    return MenuCloneOut(
+        source_menu_id=source.id,
+        menus=[
+            ClonedMenu(restaurant_location_id=location_id, menu_id=menu_id)
+            for location_id, menu_id in cloned
+        ],
+    )
@@ -14,6 +14,7 @@ from app.models.menu import (
     ModifierGroup,
 )
 from app.models.order import Order, OrderItem
+from app.schemas.menu import MenuOverrides
 from app.schemas.order import (
     OrderCreate,
     OrderItemModifierCreate,
@@ -58,13 +59,23 @@ async def create_order(
 
     unique_ids = {item.menu_item_id for item in payload.items}
 
+    menu_result = await db.execute(
+        select(Menu.id, Menu.template_id, Menu.overrides)
+        .where(Menu.restaurant_location_id == location_id, Menu.is_active.is_(True))
+        .order_by(Menu.created_at.desc())
+        .limit(1)
+    )
+    menu = menu_result.first()
+    if menu is None:
+        raise ValueError("One or more menu items are invalid.")
+    # Items of a template-backed menu live in the template's tree.
+    overrides = MenuOverrides.model_validate(menu.overrides or {})
+
     menu_items_result = await db.execute(
         select(MenuItem)
         .join(MenuCategory, MenuItem.menu_category_id == MenuCategory.id)
-        .join(Menu, MenuCategory.menu_id == Menu.id)
         .where(
-            Menu.restaurant_location_id == location_id,
-            Menu.is_active.is_(True),
+            MenuCategory.menu_id == (menu.template_id or menu.id),
             MenuCategory.is_active.is_(True),
             MenuItem.is_active.is_(True),
             MenuItem.id.in_(unique_ids),
@@ -76,7 +87,12 @@ async def create_order(
         )
     )
     menu_items = menu_items_result.scalars().all()
-    menu_map = {item.id: item for item in menu_items}
+    menu_map = {
+        item.id: item
+        for item in menu_items
+        if item.id not in overrides.hidden_items
+        and item.menu_category_id not in overrides.hidden_categories
+    }
 
     missing = [item_id for item_id in unique_ids if item_id not in menu_map]
     if missing:
@@ -87,9 +103,10 @@ async def create_order(
     for item in payload.items:
         menu_item = menu_map[item.menu_item_id]
         serialized_modifiers, modifier_delta = _resolve_modifiers(
-            menu_item, item.modifiers
+            menu_item, item.modifiers, overrides
         )
-        unit_price_cents = menu_item.price_cents + modifier_delta
+        base_price_cents = overrides.item_price(menu_item.id, menu_item.price_cents)
+        unit_price_cents = base_price_cents + modifier_delta
         line_total = unit_price_cents * item.quantity
         subtotal_cents += line_total
         order_items.append(
@@ -166,6 +183,7 @@ async def get_order(db: AsyncSession, order_id: UUID) -> OrderOut | None:
 def _resolve_modifiers(
     menu_item: MenuItem,
     selections: list[OrderItemModifierCreate],
+    overrides: MenuOverrides,
 ) -> tuple[list[dict], int]:
     linked_groups = [
         link.modifier_group
@@ -210,14 +228,15 @@ def _resolve_modifiers(
         for option in group.options:
             if option.id not in chosen_ids:
                 continue
-            option_total += option.price_cents
+            price_cents = overrides.option_price(option.id, option.price_cents)
+            option_total += price_cents
             serialized.append(
                 {
                     "modifier_group_id": str(group.id),
                     "modifier_group_name": group.name,
                     "modifier_option_id": str(option.id),
                     "modifier_option_name": option.name,
-                    "price_cents": option.price_cents,
+                    "price_cents": price_cents,
                 }
             )
 
@@ -1,6 +1,11 @@
-from sqlalchemy import select, update
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import response_cache, restaurant_key
+from app.database import is_pinned_primary
+from app.invalidation import publish_invalidation
+from app.singleflight import single_flight
 from app.models import Restaurant, RestaurantLocation, RestaurantSlug
 from app.schemas.restaurant import RestaurantDetail
 
@@ -14,12 +19,74 @@ TEMPLATE_KEYS = {
 }
 
 
+async def get_restaurant_version(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+) -> Row | None:
+    """Cheap validator lookup for conditional GETs of the detail page."""
+    if is_pinned_primary(db):
+        return await _load_restaurant_version(db, state_slug, city_slug, restaurant_slug)
+    return await single_flight.do(
+        f"{restaurant_key(state_slug, city_slug, restaurant_slug)}#version",
+        lambda: _load_restaurant_version(db, state_slug, city_slug, restaurant_slug),
+    )
+
+
+async def _load_restaurant_version(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+) -> Row | None:
+    result = await db.execute(
+        select(
+            RestaurantSlug.restaurant_location_id,
+            RestaurantSlug.is_canonical,
+            func.greatest(Restaurant.updated_at, RestaurantLocation.updated_at).label(
+                "updated_at"
+            ),
+        )
+        .join(RestaurantLocation, RestaurantLocation.id == RestaurantSlug.restaurant_location_id)
+        .join(Restaurant, Restaurant.id == RestaurantLocation.restaurant_id)
+        .where(
+            RestaurantSlug.state_slug == state_slug.lower(),
+            RestaurantSlug.city_slug == city_slug.lower(),
+            RestaurantSlug.restaurant_slug == restaurant_slug.lower(),
+        )
+    )
+    return result.one_or_none()
+
+
 async def get_restaurant_detail(
     db: AsyncSession,
     state_slug: str,
     city_slug: str,
     restaurant_slug: str,
 ) -> RestaurantDetail | None:
+    cache_key = restaurant_key(state_slug, city_slug, restaurant_slug)
+    if is_pinned_primary(db):
+        # Fresh read for a client that just wrote; it still refreshes the cache.
+        return await _load_restaurant_detail(db, state_slug, city_slug, restaurant_slug, cache_key)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    # Concurrent misses for the same page share one query.
+    return await single_flight.do(
+        cache_key,
+        lambda: _load_restaurant_detail(db, state_slug, city_slug, restaurant_slug, cache_key),
+    )
+
+
+async def _load_restaurant_detail(
+    db: AsyncSession,
+    state_slug: str,
+    city_slug: str,
+    restaurant_slug: str,
+    cache_key: str | None,
+) -> RestaurantDetail | None:
+    """Query one detail page, storing it under `cache_key` unless that is None."""
     result = await db.execute(
         select(
             Restaurant.id,
@@ -65,7 +132,7 @@ async def get_restaurant_detail(
     if row is None:
         return None
 
-    return RestaurantDetail(
+    detail = RestaurantDetail(
         id=row.id,
         name=row.name,
         phone=row.phone,
@@ -97,25 +164,9 @@ async def get_restaurant_detail(
         restaurant_slug=row.restaurant_slug,
         is_canonical=row.is_canonical,
     )
-
-
-async def get_all_slugs(db: AsyncSession) -> list[dict]:
-    """Return all canonical slugs for sitemap generation."""
-    result = await db.execute(
-        select(
-            RestaurantSlug.state_slug,
-            RestaurantSlug.city_slug,
-            RestaurantSlug.restaurant_slug,
-        ).where(RestaurantSlug.is_canonical.is_(True))
-    )
-    return [
-        {
-            "state_slug": row.state_slug,
-            "city_slug": row.city_slug,
-            "restaurant_slug": row.restaurant_slug,
-        }
-        for row in result.all()
-    ]
+    if cache_key is not None:
+        response_cache.set(cache_key, detail)
+    return detail
 
 
 async def set_restaurant_template(
@@ -151,9 +202,21 @@ async def set_restaurant_template(
         .where(RestaurantLocation.id == location_id)
         .values(template_key=normalized_template)
     )
+    # Detail pages are cached under alias slugs too, not just the canonical one.
+    slugs = await db.execute(
+        select(
+            RestaurantSlug.state_slug, RestaurantSlug.city_slug, RestaurantSlug.restaurant_slug
+        ).where(RestaurantSlug.restaurant_location_id == location_id)
+    )
+    cache_keys = [restaurant_key(*slug) for slug in slugs.all()]
+    await publish_invalidation(db, keys=cache_keys)
     await db.commit()
+    response_cache.invalidate(*cache_keys)
 
-    detail = await get_restaurant_detail(db, state_slug, city_slug, restaurant_slug)
+    # Read back on this session, bypassing the cache and single-flight: a
+    # load that started before the commit could return, and re-cache, the
+    # old template.
+    detail = await _load_restaurant_detail(db, state_slug, city_slug, restaurant_slug, None)
     if detail is None:
         raise LookupError("Restaurant not found.")
     return detail
@@ -0,0 +1,358 @@
+"""
+In-memory BM25 search backend.
+
+Builds an inverted index of restaurant name, city and state for every
+canonical slug at startup and serves `/search` without touching Postgres.
+Posting lists are stored as parallel `array` columns (document index, term
+frequency) so the whole index stays compact even for a national dataset.
+"""
+
+import asyncio
+import logging
+import math
+import re
+import time
+import uuid
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import Restaurant, RestaurantLocation, RestaurantSlug
+from app.schemas.common import PaginatedResponse, PaginationParams
+from app.schemas.restaurant import SearchResultItem
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Mirrors the most common entries of Postgres' english stop word list so the
+# two backends agree on which query terms are significant.
+STOP_WORDS = frozenset(
+    {"a", "an", "and", "at", "by", "for", "in", "of", "on", "or", "the", "to", "with"}
+)
+
+# Rows committed by a long-running import carry the transaction start time in
+# `updated_at`, so each incremental refresh re-reads a short overlap window.
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+# Rebuild posting lists once this fraction of documents has been replaced.
+COMPACT_RATIO = 0.25
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOP_WORDS:
+            continue
+        # Cheap plural folding so "dumplings" matches "dumpling".
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+@dataclass(slots=True)
+class _Doc:
+    location_id: uuid.UUID
+    name: str
+    phone: str | None
+    address1: str
+    city: str
+    state: str
+    state_slug: str
+    city_slug: str
+    restaurant_slug: str
+    length: int
+
+
+class SearchIndex:
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.ready = False
+        self.watermark: datetime | None = None
+        # time.monotonic() of the last build or prune.
+        self.pruned_at: float | None = None
+        self._refresh_requested = asyncio.Event()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._docs: list[_Doc | None] = []
+        self._doc_index: dict[uuid.UUID, int] = {}
+        # term -> (document indexes, term frequencies)
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._df: dict[str, int] = {}
+        self._total_length = 0
+        self._dead = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._doc_index)
+
+    def _add(self, doc: _Doc, tokens: list[str]) -> None:
+        old = self._doc_index.get(doc.location_id)
+        if old is not None:
+            self._remove_at(old)
+
+        index = len(self._docs)
+        self._docs.append(doc)
+        self._doc_index[doc.location_id] = index
+        self._total_length += doc.length
+
+        counts: dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for term, tf in counts.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = (array("I"), array("H"))
+                self._postings[term] = posting
+            posting[0].append(index)
+            posting[1].append(min(tf, 0xFFFF))
+            self._df[term] = self._df.get(term, 0) + 1
+
+    def _remove_at(self, index: int) -> None:
+        doc = self._docs[index]
+        if doc is None:
+            return
+        for term in set(tokenize(f"{doc.name} {doc.city} {doc.state}")):
+            remaining = self._df.get(term, 0) - 1
+            if remaining > 0:
+                self._df[term] = remaining
+            else:
+                self._df.pop(term, None)
+        self._docs[index] = None
+        del self._doc_index[doc.location_id]
+        self._total_length -= doc.length
+        self._dead += 1
+
+    def _compact(self) -> None:
+        live = [doc for doc in self._docs if doc is not None]
+        self._reset()
+        for doc in live:
+            self._add(doc, tokenize(f"{doc.name} {doc.city} {doc.state}"))
+
+    def upsert_rows(self, rows) -> int:
+        count = 0
+        for row in rows:
+            tokens = tokenize(f"{row.name} {row.city} {row.state}")
+            self._add(
+                _Doc(
+                    location_id=row.location_id,
+                    name=row.name,
+                    phone=row.phone,
+                    address1=row.address1,
+                    city=row.city,
+                    state=row.state,
+                    state_slug=row.state_slug,
+                    city_slug=row.city_slug,
+                    restaurant_slug=row.restaurant_slug,
+                    length=len(tokens),
+                ),
+                tokens,
+            )
+            count += 1
+            if row.changed_at is not None and (
+                self.watermark is None or row.changed_at > self.watermark
+            ):
+                self.watermark = row.changed_at
+        if self._dead > COMPACT_RATIO * max(len(self._docs), 1):
+            self._compact()
+        return count
+
+    def remove(self, location_ids) -> None:
+        for location_id in location_ids:
+            index = self._doc_index.get(location_id)
+            if index is not None:
+                self._remove_at(index)
+        if self._dead > COMPACT_RATIO * max(len(self._docs), 1):
+            self._compact()
+
+    def search(
+        self,
+        q: str,
+        pagination: PaginationParams,
+        state: str | None = None,
+        city: str | None = None,
+    ) -> PaginatedResponse[SearchResultItem]:
+        terms = list(dict.fromkeys(tokenize(q)))
+        matches: list[tuple[float, _Doc]] = []
+
+        if terms and all(term in self._postings for term in terms):
+            n_docs = self.size
+            avg_length = self._total_length / n_docs if n_docs else 0.0
+            state_filter = state.upper() if state else None
+            city_filter = city.lower() if city else None
+
+            # Rarest term first keeps the candidate set small; like
+            # plainto_tsquery, every term must match.
+            terms.sort(key=lambda t: self._df.get(t, 0))
+            scores: dict[int, float] | None = None
+            for term in terms:
+                doc_indexes, freqs = self._postings[term]
+                df = self._df.get(term, 0)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                term_scores: dict[int, float] = {}
+                for index, tf in zip(doc_indexes, freqs):
+                    if scores is not None and index not in scores:
+                        continue
+                    doc = self._docs[index]
+                    if doc is None:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * doc.length / avg_length)
+                    term_scores[index] = idf * tf * (self.k1 + 1) / (tf + norm)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        index: score + term_scores[index]
+                        for index, score in scores.items()
+                        if index in term_scores
+                    }
+                if not scores:
+                    break
+
+            for index, score in (scores or {}).items():
+                doc = self._docs[index]
+                if state_filter and doc.state != state_filter:
+                    continue
+                if city_filter and doc.city_slug != city_filter:
+                    continue
+                matches.append((score, doc))
+
+        matches.sort(key=lambda m: (-m[0], m[1].name))
+        total = len(matches)
+        page = matches[pagination.offset : pagination.offset + pagination.page_size]
+        items = [
+            SearchResultItem(
+                name=doc.name,
+                phone=doc.phone,
+                address1=doc.address1,
+                city=doc.city,
+                state=doc.state,
+                state_slug=doc.state_slug,
+                city_slug=doc.city_slug,
+                restaurant_slug=doc.restaurant_slug,
+                rank=round(score, 6),
+            )
+            for score, doc in page
+        ]
+
+        return PaginatedResponse(
+            items=items,
+            total=total,
+            page=pagination.page,
+            page_size=pagination.page_size,
+            total_pages=math.ceil(total / pagination.page_size) if total > 0 else 0,
+        )
+
+    async def _load(self, db: AsyncSession, since: datetime | None) -> int:
+        changed_at = func.greatest(
+            RestaurantLocation.updated_at, Restaurant.updated_at
+        ).label("changed_at")
+        query = (
+            select(
+                RestaurantLocation.id.label("location_id"),
+                Restaurant.name,
+                Restaurant.phone,
+                RestaurantLocation.address1,
+                RestaurantLocation.city,
+                RestaurantLocation.state,
+                RestaurantSlug.state_slug,
+                RestaurantSlug.city_slug,
+                RestaurantSlug.restaurant_slug,
+                changed_at,
+            )
+            .join(RestaurantLocation, Restaurant.id == RestaurantLocation.restaurant_id)
+            .join(RestaurantSlug, RestaurantLocation.id == RestaurantSlug.restaurant_location_id)
+            .where(RestaurantSlug.is_canonical.is_(True))
+        )
+        if since is not None:
+            query = query.where(changed_at > since)
+
+        loaded = 0
+        result = await db.stream(query.execution_options(yield_per=5000))
+        async for partition in result.partitions():
+            loaded += self.upsert_rows(partition)
+        return loaded
+
+    async def build(self, db: AsyncSession) -> int:
+        """Load every canonical restaurant into a fresh index."""
+        fresh = SearchIndex(self.k1, self.b)
+        loaded = await fresh._load(db, None)
+        # Swap in one step so concurrent searches never see a partial index.
+        self._docs = fresh._docs
+        self._doc_index = fresh._doc_index
+        self._postings = fresh._postings
+        self._df = fresh._df
+        self._total_length = fresh._total_length
+        self._dead = fresh._dead
+        self.watermark = fresh.watermark
+        self.pruned_at = time.monotonic()
+        self.ready = True
+        return loaded
+
+    async def _prune(self, db: AsyncSession) -> int:
+        """Drop locations that were deleted or lost their canonical slug."""
+        result = await db.execute(
+            select(RestaurantSlug.restaurant_location_id).where(
+                RestaurantSlug.is_canonical.is_(True)
+            )
+        )
+        dead = self._doc_index.keys() - set(result.scalars())
+        self.remove(dead)
+        self.pruned_at = time.monotonic()
+        return len(dead)
+
+    async def refresh(self, db: AsyncSession, prune: bool = False) -> int:
+        """Re-index rows changed since the last build or refresh.
+
+        Deletions leave no changed row behind, so with `prune` the indexed
+        ids are also checked against the live canonical slugs. That scans
+        every location, so callers do it far less often than they refresh.
+        Pruning runs before the load, so a location added in between is
+        never dropped.
+        """
+        if not self.ready:
+            return await self.build(db)
+        if prune:
+            removed = await self._prune(db)
+            if removed:
+                logger.info("Search index dropped %d removed restaurants", removed)
+        since = self.watermark - REFRESH_OVERLAP if self.watermark else None
+        return await self._load(db, since)
+
+    def request_refresh(self) -> None:
+        """Wake the refresh loop early, e.g. on a change notification."""
+        self._refresh_requested.set()
+
+    async def run_refresh_loop(
+        self,
+        session_maker: async_sessionmaker,
+        interval_seconds: float,
+        prune_seconds: float,
+    ) -> None:
+        while True:
+            try:
+                async with session_maker() as db:
+                    if self.ready:
+                        prune = time.monotonic() - self.pruned_at >= prune_seconds
+                        await self.refresh(db, prune=prune)
+                    else:
+                        loaded = await self.build(db)
+                        logger.info("Search index built with %d restaurants", loaded)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Search index refresh failed")
+            try:
+                await asyncio.wait_for(self._refresh_requested.wait(), interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._refresh_requested.clear()
+
+
+search_index = SearchIndex()
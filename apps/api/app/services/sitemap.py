@@ -0,0 +1,203 @@
+"""
+Sharded XML sitemaps.
+
+Restaurant URLs are streamed from a server-side cursor into numbered shards
+of at most SHARD_SIZE URLs (the protocol limit is 50,000). State and city
+pages go into a separate directory sitemap. Every document is kept as
+precompressed gzip bytes and rebuilt only when the slug version changes.
+"""
+
+import asyncio
+import gzip
+import io
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Restaurant, RestaurantLocation, RestaurantSlug
+
+SHARD_SIZE = 45_000
+
+XML_HEADER = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = b"</urlset>\n"
+
+
+def _gzip_writer(buf: io.BytesIO) -> gzip.GzipFile:
+    return gzip.GzipFile(filename="", mode="wb", fileobj=buf, mtime=0, compresslevel=6)
+
+
+def _url_entry(loc: str, lastmod: datetime | None) -> bytes:
+    parts = [f"<url><loc>{escape(loc)}</loc>"]
+    if lastmod is not None:
+        parts.append(f"<lastmod>{lastmod.date().isoformat()}</lastmod>")
+    parts.append("</url>\n")
+    return "".join(parts).encode("utf-8")
+
+
+@dataclass
+class SitemapSnapshot:
+    version: tuple
+    shards: list[bytes] = field(default_factory=list)
+    shard_lastmods: list[datetime | None] = field(default_factory=list)
+    directory: bytes = b""
+    directory_lastmod: datetime | None = None
+    index: bytes = b""
+    checked_at: float = 0.0
+
+
+def _render_index(snapshot: SitemapSnapshot, base_url: str) -> bytes:
+    """Gzipped sitemap index pointing at the public shard URLs."""
+    entries = [("directory.xml", snapshot.directory_lastmod)]
+    entries += [
+        (f"restaurants-{n}.xml", lastmod)
+        for n, lastmod in enumerate(snapshot.shard_lastmods)
+    ]
+    buf = io.BytesIO()
+    with _gzip_writer(buf) as out:
+        out.write(XML_HEADER)
+        out.write(b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        for name, lastmod in entries:
+            out.write(f"<sitemap><loc>{escape(base_url)}/sitemaps/{name}</loc>".encode())
+            if lastmod is not None:
+                out.write(f"<lastmod>{lastmod.date().isoformat()}</lastmod>".encode())
+            out.write(b"</sitemap>\n")
+        out.write(b"</sitemapindex>\n")
+    return buf.getvalue()
+
+
+async def _slug_version(db: AsyncSession) -> tuple:
+    result = await db.execute(
+        select(
+            func.count(),
+            func.max(RestaurantSlug.created_at),
+            select(func.max(RestaurantLocation.updated_at)).scalar_subquery(),
+            select(func.max(Restaurant.updated_at)).scalar_subquery(),
+        ).where(RestaurantSlug.is_canonical.is_(True))
+    )
+    return tuple(result.one())
+
+
+async def _build_snapshot(db: AsyncSession, version: tuple) -> SitemapSnapshot:
+    base_url = settings.site_url.rstrip("/")
+    snapshot = SitemapSnapshot(version=version)
+    states: dict[str, datetime | None] = {}
+    cities: dict[tuple[str, str], datetime | None] = {}
+
+    buf: io.BytesIO | None = None
+    out: gzip.GzipFile | None = None
+    in_shard = 0
+    shard_lastmod: datetime | None = None
+
+    def close_shard() -> None:
+        out.write(URLSET_CLOSE)
+        out.close()
+        snapshot.shards.append(buf.getvalue())
+        snapshot.shard_lastmods.append(shard_lastmod)
+
+    query = (
+        select(
+            RestaurantSlug.state_slug,
+            RestaurantSlug.city_slug,
+            RestaurantSlug.restaurant_slug,
+            func.greatest(RestaurantLocation.updated_at, Restaurant.updated_at).label("lastmod"),
+        )
+        .join(RestaurantLocation, RestaurantLocation.id == RestaurantSlug.restaurant_location_id)
+        .join(Restaurant, Restaurant.id == RestaurantLocation.restaurant_id)
+        .where(RestaurantSlug.is_canonical.is_(True))
+        .order_by(
+            RestaurantSlug.state_slug,
+            RestaurantSlug.city_slug,
+            RestaurantSlug.restaurant_slug,
+        )
+        .execution_options(yield_per=5000)
+    )
+    result = await db.stream(query)
+    async for row in result:
+        if out is None or in_shard >= SHARD_SIZE:
+            if out is not None:
+                close_shard()
+            buf = io.BytesIO()
+            out = _gzip_writer(buf)
+            out.write(XML_HEADER)
+            out.write(URLSET_OPEN)
+            in_shard = 0
+            shard_lastmod = None
+
+        lastmod = row.lastmod
+        out.write(
+            _url_entry(
+                f"{base_url}/{row.state_slug}/{row.city_slug}/{row.restaurant_slug}",
+                lastmod,
+            )
+        )
+        in_shard += 1
+        if lastmod is not None:
+            if shard_lastmod is None or lastmod > shard_lastmod:
+                shard_lastmod = lastmod
+            city_key = (row.state_slug, row.city_slug)
+            if cities.get(city_key) is None or lastmod > cities[city_key]:
+                cities[city_key] = lastmod
+            if states.get(row.state_slug) is None or lastmod > states[row.state_slug]:
+                states[row.state_slug] = lastmod
+        else:
+            cities.setdefault((row.state_slug, row.city_slug), None)
+            states.setdefault(row.state_slug, None)
+
+    if out is not None:
+        close_shard()
+
+    directory_lastmod = max((m for m in states.values() if m is not None), default=None)
+    dir_buf = io.BytesIO()
+    with _gzip_writer(dir_buf) as directory:
+        directory.write(XML_HEADER)
+        directory.write(URLSET_OPEN)
+        directory.write(_url_entry(f"{base_url}/", directory_lastmod))
+        for state_slug, lastmod in sorted(states.items()):
+            directory.write(_url_entry(f"{base_url}/{state_slug}", lastmod))
+        for (state_slug, city_slug), lastmod in sorted(cities.items()):
+            directory.write(_url_entry(f"{base_url}/{state_slug}/{city_slug}", lastmod))
+        directory.write(URLSET_CLOSE)
+    snapshot.directory = dir_buf.getvalue()
+    snapshot.directory_lastmod = directory_lastmod
+    snapshot.index = _render_index(snapshot, base_url)
+    return snapshot
+
+
+_snapshot: SitemapSnapshot | None = None
+_lock = asyncio.Lock()
+
+
+async def get_sitemap_snapshot(db: AsyncSession) -> SitemapSnapshot:
+    """Return the cached snapshot, rebuilding it if the slug version moved.
+
+    The version check itself is rate limited to once per
+    `sitemap_recheck_seconds` so crawlers walking every shard cost nothing.
+    """
+    global _snapshot
+    snapshot = _snapshot
+    now = time.monotonic()
+    if snapshot is not None and now - snapshot.checked_at < settings.sitemap_recheck_seconds:
+        return snapshot
+
+    async with _lock:
+        snapshot = _snapshot
+        if snapshot is not None and now - snapshot.checked_at < settings.sitemap_recheck_seconds:
+            return snapshot
+        version = await _slug_version(db)
+        if snapshot is None or snapshot.version != version:
+            snapshot = await _build_snapshot(db, version)
+        snapshot.checked_at = time.monotonic()
+        _snapshot = snapshot
+        return snapshot
+
+
+def invalidate_sitemap() -> None:
+    """Force the next request to re-check the slug version."""
+    if _snapshot is not None:
+        _snapshot.checked_at = 0.0
@@ -0,0 +1,192 @@
+import csv
+import gzip
+import math
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Restaurant, RestaurantLocation, RestaurantSlug
+from app.schemas.common import PaginatedResponse, PaginationParams
+from app.schemas.restaurant import SearchResultItem
+
+ZIP_CENTROIDS_PATH = Path(__file__).resolve().parent.parent / "data" / "zip_centroids.csv.gz"
+
+# "07001" or "07001-1234", optionally surrounded by whitespace.
+ZIP_QUERY_RE = re.compile(r"^\s*(\d{5})(?:-\d{4})?\s*$")
+
+MILES_PER_DEGREE_LAT = 69.0
+MAX_RADIUS_MILES = 50.0
+
+
+def parse_zip(q: str) -> str | None:
+    """Return the 5-digit zip if the query is a bare zip code, else None."""
+    match = ZIP_QUERY_RE.match(q)
+    return match.group(1) if match else None
+
+
+def haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 3958.8 * 2 * math.asin(math.sqrt(a))
+
+
+class ZipCentroids:
+    """Offline zip -> (lat, lng) table bucketed into 1-degree grid cells."""
+
+    def __init__(self, centroids: dict[str, tuple[float, float]]):
+        self.centroids = centroids
+        self._cells: dict[tuple[int, int], list[str]] = {}
+        for zip_code, (lat, lng) in centroids.items():
+            self._cells.setdefault((math.floor(lat), math.floor(lng)), []).append(zip_code)
+
+    @classmethod
+    def load(cls, path: Path = ZIP_CENTROIDS_PATH) -> "ZipCentroids":
+        centroids: dict[str, tuple[float, float]] = {}
+        if path.exists():
+            with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    centroids[row["zip"]] = (float(row["lat"]), float(row["lng"]))
+        return cls(centroids)
+
+    def get(self, zip_code: str) -> tuple[float, float] | None:
+        return self.centroids.get(zip_code)
+
+    def nearby(self, zip_code: str, radius_miles: float) -> list[tuple[str, float]]:
+        """Zips whose centroid lies within radius of zip_code, nearest first."""
+        origin = self.centroids.get(zip_code)
+        if origin is None:
+            return [(zip_code, 0.0)]
+        lat, lng = origin
+        lat_span = math.ceil(radius_miles / MILES_PER_DEGREE_LAT)
+        lng_span = math.ceil(
+            radius_miles / (MILES_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+        )
+        cell_lat, cell_lng = math.floor(lat), math.floor(lng)
+
+        found: list[tuple[str, float]] = []
+        for dlat in range(-lat_span, lat_span + 1):
+            for dlng in range(-lng_span, lng_span + 1):
+                for candidate in self._cells.get((cell_lat + dlat, cell_lng + dlng), ()):
+                    c_lat, c_lng = self.centroids[candidate]
+                    distance = haversine_miles(lat, lng, c_lat, c_lng)
+                    if distance <= radius_miles:
+                        found.append((candidate, distance))
+        found.sort(key=lambda z: (z[1], z[0]))
+        return found
+
+
+@lru_cache(maxsize=1)
+def get_zip_centroids() -> ZipCentroids:
+    return ZipCentroids.load()
+
+
+async def search_by_zip(
+    db: AsyncSession,
+    zip_code: str,
+    pagination: PaginationParams,
+    radius_miles: float = 0.0,
+    state: str | None = None,
+    city: str | None = None,
+) -> PaginatedResponse[SearchResultItem]:
+    radius_miles = min(max(radius_miles, 0.0), MAX_RADIUS_MILES)
+    centroids = get_zip_centroids()
+    origin = centroids.get(zip_code)
+
+    if radius_miles > 0 and origin is not None:
+        zip_codes = [z for z, _ in centroids.nearby(zip_code, radius_miles)]
+    else:
+        zip_codes = [zip_code]
+
+    if origin is not None:
+        origin_lat, origin_lng = origin
+        # Equirectangular approximation; accurate to well under a mile at
+        # these radii and cheap enough to order by in SQL.
+        lng_scale = math.cos(math.radians(origin_lat))
+        distance = case(
+            (
+                RestaurantLocation.lat.is_not(None),
+                MILES_PER_DEGREE_LAT
+                * func.sqrt(
+                    func.power(RestaurantLocation.lat - origin_lat, 2)
+                    + func.power((RestaurantLocation.lng - origin_lng) * lng_scale, 2)
+                ),
+            ),
+            else_=None,
+        )
+    else:
+        distance = literal(None)
+    distance = distance.label("distance")
+
+    base = (
+        select(
+            Restaurant.name,
+            Restaurant.phone,
+            RestaurantLocation.address1,
+            RestaurantLocation.city,
+            RestaurantLocation.state,
+            RestaurantSlug.state_slug,
+            RestaurantSlug.city_slug,
+            RestaurantSlug.restaurant_slug,
+            (RestaurantLocation.zip == zip_code).label("exact"),
+            distance,
+        )
+        .join(RestaurantLocation, Restaurant.id == RestaurantLocation.restaurant_id)
+        .join(RestaurantSlug, RestaurantLocation.id == RestaurantSlug.restaurant_location_id)
+        .where(
+            RestaurantLocation.zip.in_(zip_codes),
+            RestaurantSlug.is_canonical.is_(True),
+        )
+    )
+
+    if state:
+        base = base.where(RestaurantLocation.state == state.upper())
+    if city:
+        base = base.where(RestaurantSlug.city_slug == city.lower())
+
+    count_result = await db.execute(
+        select(func.count()).select_from(base.subquery())
+    )
+    total = count_result.scalar() or 0
+
+    result = await db.execute(
+        base.order_by(
+            (RestaurantLocation.zip == zip_code).desc(),
+            distance.asc().nulls_last(),
+            Restaurant.name,
+        )
+        .offset(pagination.offset)
+        .limit(pagination.page_size)
+    )
+    items = [
+        SearchResultItem(
+            name=row.name,
+            phone=row.phone,
+            address1=row.address1,
+            city=row.city,
+            state=row.state,
+            state_slug=row.state_slug,
+            city_slug=row.city_slug,
+            restaurant_slug=row.restaurant_slug,
+            rank=(
+                1.0
+                if row.exact
+                else 1.0 / (1.0 + (radius_miles if row.distance is None else row.distance))
+            ),
+            distance_miles=round(row.distance, 2) if row.distance is not None else None,
+        )
+        for row in result.all()
+    ]
+
+    return PaginatedResponse(
+        items=items,
+        total=total,
+        page=pagination.page,
+        page_size=pagination.page_size,
+        total_pages=math.ceil(total / pagination.page_size) if total > 0 else 0,
+    )
@@ -0,0 +1,99 @@
+"""
+Request coalescing for identical concurrent reads.
+
+The first caller for a key (the leader) runs the load on its own session;
+callers that arrive while it is in flight (followers) await the leader's
+result instead of issuing the same queries. A follower that waits longer
+than the per-key timeout, or whose leader was cancelled, runs the load
+itself so one slow request can never stall the rest.
+"""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+# Cap on the number of keys whose coalescing counters are retained.
+MAX_TRACKED_KEYS = 10_000
+
+# Resolved into a follower's future when the leader was cancelled.
+_ABANDONED = object()
+
+
+class SingleFlight:
+    def __init__(self, default_timeout: float):
+        self.default_timeout = default_timeout
+        self._calls: dict[str, asyncio.Future] = {}
+        self._key_stats: OrderedDict[str, int] = OrderedDict()
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.fallbacks = 0
+
+    def _record_coalesced(self, key: str) -> None:
+        self.coalesced += 1
+        count = self._key_stats.pop(key, 0)
+        self._key_stats[key] = count + 1
+        if len(self._key_stats) > MAX_TRACKED_KEYS:
+            self._key_stats.popitem(last=False)
+
+    async def do(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[T]],
+        timeout: float | None = None,
+    ) -> T:
+        future = self._calls.get(key)
+        if future is not None:
+            self._record_coalesced(key)
+            try:
+                # Shielded so a follower timing out never cancels the leader.
+                result = await asyncio.wait_for(
+                    asyncio.shield(future),
+                    self.default_timeout if timeout is None else timeout,
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                return await load()
+            if result is _ABANDONED:
+                self.fallbacks += 1
+                return await load()
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.leaders += 1
+        try:
+            result = await load()
+        except asyncio.CancelledError:
+            future.set_result(_ABANDONED)
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an unobserved failure is not logged twice.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def stats(self, limit: int = 50) -> dict[str, Any]:
+        top_keys = sorted(self._key_stats.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "fallbacks": self.fallbacks,
+            "keys": [{"key": key, "coalesced": count} for key, count in top_keys],
+        }
+
+
+single_flight = SingleFlight(default_timeout=settings.singleflight_timeout_seconds)
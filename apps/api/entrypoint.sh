@@ -7,5 +7,21 @@ if [ -f alembic.ini ] && [ -d alembic/versions ]; then
     alembic upgrade head
 fi
 
-echo "Starting API server..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+# dev: single uvicorn process with auto-reload.
+# prod: gunicorn managing uvicorn workers (see gunicorn.conf.py).
+APP_MODE="${APP_MODE:-dev}"
+
+case "$APP_MODE" in
+    dev)
+        echo "Starting API server (dev)..."
+        exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8000}" --reload
+        ;;
+    prod)
+        echo "Starting API server (prod)..."
+        exec gunicorn app.main:app --config gunicorn.conf.py
+        ;;
+    *)
+        echo "Unknown APP_MODE: $APP_MODE (expected dev or prod)" >&2
+        exit 1
+        ;;
+esac
@@ -0,0 +1,73 @@
+"""
+Gunicorn settings for production (APP_MODE=prod in entrypoint.sh).
+
+Gunicorn supervises several uvicorn worker processes. Uvicorn uses uvloop
+and httptools automatically when they are installed (uvicorn[standard]).
+Every value can be overridden through the environment variables read
+below.
+"""
+
+import os
+import shutil
+
+# Workers share Prometheus metrics through files in this directory. It must
+# be prepared before the preloaded app imports prometheus_client. The config
+# is re-read on SIGHUP, so only wipe files left by a previous run once.
+_metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-multiproc")
+if not os.environ.get("_PROMETHEUS_MULTIPROC_READY"):
+    shutil.rmtree(_metrics_dir, ignore_errors=True)
+    os.makedirs(_metrics_dir, exist_ok=True)
+    os.environ["_PROMETHEUS_MULTIPROC_READY"] = "1"
+
+
+def _cpu_count() -> int:
+    # Respect container CPU affinity rather than the host's core count.
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn_worker.UvicornWorker"
+# Async workers are not blocked by I/O, so one per core is enough; each one
+# holds its own connection pools, so keep this in step with Postgres limits.
+workers = int(os.getenv("WEB_CONCURRENCY", _cpu_count()))
+
+# Import the app once in the master so workers fork with it loaded.
+preload_app = True
+
+# Recycle workers periodically to bound memory growth; jitter keeps them
+# from all restarting at once.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+
+# On SIGTERM workers stop accepting connections and get this long to finish
+# in-flight requests before being killed.
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+accesslog = "-"
+errorlog = "-"
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    # Live gauges from a dead worker must stop counting.
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):
+    # Pools created while preloading must not be shared across processes.
+    from app import database
+
+    for engine in {
+        database.engine,
+        database.read_engine,
+        database.admin_engine,
+        database.order_engine,
+    }:
+        engine.sync_engine.dispose(close=False)
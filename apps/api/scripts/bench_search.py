@@ -0,0 +1,107 @@
+"""
+Benchmark the Postgres and in-memory BM25 search backends side by side.
+
+Usage:
+    python -m scripts.bench_search
+    python -m scripts.bench_search --queries 200 --rounds 5 --state nj
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import select
+
+from app.database import async_session_maker
+from app.models import Restaurant, RestaurantLocation
+from app.schemas.common import PaginationParams
+from app.services.search import search_restaurants
+from app.services.search_index import SearchIndex, tokenize
+
+
+async def sample_queries(count: int, seed: int) -> list[str]:
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(Restaurant.name, RestaurantLocation.city)
+            .join(RestaurantLocation, Restaurant.id == RestaurantLocation.restaurant_id)
+            .limit(5000)
+        )
+        rows = result.all()
+
+    rng = random.Random(seed)
+    queries: list[str] = []
+    for name, city in rng.sample(rows, min(count, len(rows))):
+        tokens = tokenize(name)
+        if not tokens:
+            continue
+        # Mix single-term, multi-term and name + city queries.
+        shape = rng.randrange(3)
+        if shape == 0:
+            queries.append(rng.choice(tokens))
+        elif shape == 1:
+            queries.append(" ".join(tokens[:2]))
+        else:
+            queries.append(f"{tokens[0]} {city}")
+    return queries
+
+
+def summarize(label: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) >= 20 else timings[-1]
+    print(
+        f"  {label:<9} mean {statistics.mean(timings) * 1000:8.3f} ms"
+        f"   p50 {statistics.median(timings) * 1000:8.3f} ms"
+        f"   p95 {p95 * 1000:8.3f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark search backends")
+    parser.add_argument("--queries", type=int, default=100, help="Number of sampled queries")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the query set")
+    parser.add_argument("--state", type=str, help="Optional state filter (e.g. nj)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    index = SearchIndex()
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        loaded = await index.build(session)
+    print(f"Built in-memory index: {loaded} restaurants in {time.perf_counter() - started:.2f}s")
+
+    queries = await sample_queries(args.queries, args.seed)
+    if not queries:
+        print("No restaurants to sample queries from.")
+        return
+    pagination = PaginationParams(page=1, page_size=20)
+
+    pg_timings: list[float] = []
+    mem_timings: list[float] = []
+    overlap: list[float] = []
+    async with async_session_maker() as session:
+        for _ in range(args.rounds):
+            for q in queries:
+                started = time.perf_counter()
+                pg = await search_restaurants(session, q, pagination, state=args.state)
+                pg_timings.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                mem = index.search(q, pagination, state=args.state)
+                mem_timings.append(time.perf_counter() - started)
+
+                pg_slugs = {(i.state_slug, i.city_slug, i.restaurant_slug) for i in pg.items}
+                mem_slugs = {(i.state_slug, i.city_slug, i.restaurant_slug) for i in mem.items}
+                if pg_slugs:
+                    overlap.append(len(pg_slugs & mem_slugs) / len(pg_slugs))
+
+    print(f"\n{len(queries)} queries x {args.rounds} rounds")
+    summarize("postgres", pg_timings)
+    summarize("memory", mem_timings)
+    if overlap:
+        print(f"  Top-20 overlap with postgres: {statistics.mean(overlap) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
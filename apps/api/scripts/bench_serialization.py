@@ -0,0 +1,171 @@
+"""
+Benchmark response serialization for the menu and city endpoints.
+
+Compares the default path (rows -> pydantic models -> FastAPI's
+response_model serialization) with the FAST_JSON path (rows -> dicts ->
+pydantic-core encoding). Both start from the same ORM-shaped rows and run
+the same shaping code the services use. Synthetic rows are used, so no
+database is needed. Cache hits on the fast path skip this work entirely.
+
+Usage:
+    python -m scripts.bench_serialization
+    python -m scripts.bench_serialization --categories 12 --items 10 --rounds 500
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import statistics
+import time
+import uuid
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.schemas.common import PaginatedResponse, PaginationParams
+from app.schemas.menu import MenuOut
+from app.schemas.restaurant import RestaurantListItem
+from app.serialization import encode_json
+from app.services.browse import _page
+from app.services.menu import _build_menu_out, _menu_dict
+
+SUPPORTS_DUMP_JSON = "dump_json" in inspect.signature(serialize_response).parameters
+
+
+def fake_menu(categories: int, items: int, groups: int, options: int) -> SimpleNamespace:
+    """ORM-shaped stand-in for a fully loaded Menu."""
+
+    def option(n: int) -> SimpleNamespace:
+        return SimpleNamespace(
+            id=uuid.uuid4(), name=f"Option {n}", price_cents=50 * n,
+            is_default=n == 0, sort_order=n,
+        )
+
+    def group(n: int) -> SimpleNamespace:
+        return SimpleNamespace(
+            id=uuid.uuid4(), name=f"Choice {n}", description="Pick one",
+            min_select=0, max_select=1, is_required=False, sort_order=n,
+            options=[option(o) for o in range(options)],
+        )
+
+    def item(n: int) -> SimpleNamespace:
+        return SimpleNamespace(
+            id=uuid.uuid4(), name=f"General Tso's Chicken {n}",
+            description="Crispy chicken in a sweet and spicy sauce",
+            price_cents=1295, sort_order=n, is_active=True,
+            modifier_group_links=[
+                SimpleNamespace(modifier_group=group(g)) for g in range(groups)
+            ],
+        )
+
+    return SimpleNamespace(
+        id=uuid.uuid4(), name="Main Menu", is_active=True,
+        template_id=None, template=None, overrides=None,
+        categories=[
+            SimpleNamespace(
+                id=uuid.uuid4(), name=f"Category {c}", description=None,
+                sort_order=c, is_active=True,
+                items=[item(i) for i in range(items)],
+            )
+            for c in range(categories)
+        ],
+    )
+
+
+def fake_city_rows(count: int) -> list[dict]:
+    # What `row._asdict()` yields for the city listing query.
+    return [
+        {
+            "name": f"Golden Dragon {n}",
+            "phone": "(908) 555-0100",
+            "has_online_ordering": False,
+            "has_ai_phone": False,
+            "is_claimed": False,
+            "address1": f"{n} Main St",
+            "city": "Clinton",
+            "state": "NJ",
+            "zip": "08809",
+            "state_slug": "nj",
+            "city_slug": "clinton",
+            "restaurant_slug": f"golden-dragon-{n}",
+            "rating": 4.4,
+            "user_rating_count": 212,
+            "price_level": "PRICE_LEVEL_INEXPENSIVE",
+        }
+        for n in range(count)
+    ]
+
+
+async def fastapi_serialize(field, value) -> bytes:
+    if SUPPORTS_DUMP_JSON:
+        return await serialize_response(field=field, response_content=value, dump_json=True)
+    return JSONResponse(await serialize_response(field=field, response_content=value)).body
+
+
+async def measure(label: str, default_path, fast_path, rounds: int) -> None:
+    baseline = await default_path()
+    fast = await fast_path()
+    print(f"{label}: {len(baseline):,} bytes per response")
+
+    results: dict[str, list[float]] = {}
+    for name, path in (("default", default_path), ("fast_json", fast_path)):
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            await path()
+            timings.append(time.perf_counter() - started)
+        results[name] = sorted(timings)
+
+    for name, timings in results.items():
+        p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) >= 20 else timings[-1]
+        print(
+            f"  {name:<9} mean {statistics.mean(timings) * 1000:8.3f} ms"
+            f"   p50 {statistics.median(timings) * 1000:8.3f} ms"
+            f"   p95 {p95 * 1000:8.3f} ms"
+        )
+    speedup = statistics.mean(results["default"]) / statistics.mean(results["fast_json"])
+    same = json.loads(baseline) == json.loads(fast)
+    print(f"  speedup   {speedup:.2f}x   same JSON: {same}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument("--categories", type=int, default=12, help="Menu categories")
+    parser.add_argument("--items", type=int, default=10, help="Items per category")
+    parser.add_argument("--groups", type=int, default=2, help="Modifier groups per item")
+    parser.add_argument("--options", type=int, default=4, help="Options per modifier group")
+    parser.add_argument("--page-size", type=int, default=100, help="City page size")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    menu = fake_menu(args.categories, args.items, args.groups, args.options)
+    rows = fake_city_rows(args.page_size)
+    pagination = PaginationParams(page=1, page_size=args.page_size)
+    menu_field = create_model_field("Response", MenuOut, mode="serialization")
+    city_model = PaginatedResponse[RestaurantListItem]
+    city_field = create_model_field("Response", city_model, mode="serialization")
+
+    async def menu_default() -> bytes:
+        return await fastapi_serialize(menu_field, _build_menu_out(menu))
+
+    async def menu_fast() -> bytes:
+        return encode_json(_menu_dict(menu))
+
+    async def city_default() -> bytes:
+        page = city_model.model_validate(_page(rows, len(rows), pagination))
+        return await fastapi_serialize(city_field, page)
+
+    async def city_fast() -> bytes:
+        return encode_json(_page(rows, len(rows), pagination))
+
+    await measure("Menu (/menus/{state}/{city}/{slug})", menu_default, menu_fast, args.rounds)
+    await measure(
+        "City page (/browse/{state}/{city}/restaurants)", city_default, city_fast, args.rounds
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
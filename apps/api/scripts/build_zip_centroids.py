@@ -0,0 +1,89 @@
+"""
+Rebuild the bundled zip centroid table used by zip-radius search.
+
+Accepts the Census ZCTA gazetteer file (tab separated, GEOID/INTPTLAT/INTPTLONG
+columns) or any CSV with zip/lat/lng columns, and writes
+app/data/zip_centroids.csv.gz.
+
+Usage:
+    python -m scripts.build_zip_centroids 2023_Gaz_zcta_national.txt
+    python -m scripts.build_zip_centroids zips.csv --output /tmp/zip_centroids.csv.gz
+"""
+
+import argparse
+import csv
+import gzip
+import io
+from pathlib import Path
+
+from app.services.zip_search import ZIP_CENTROIDS_PATH
+
+ZIP_COLUMNS = ("zip", "zip_code", "GEOID")
+LAT_COLUMNS = ("lat", "latitude", "INTPTLAT")
+LNG_COLUMNS = ("lng", "long", "longitude", "INTPTLONG")
+
+
+def _pick(row: dict, names: tuple[str, ...]) -> str | None:
+    for name in names:
+        value = row.get(name)
+        if value:
+            return value.strip()
+    return None
+
+
+def read_centroids(path: Path) -> dict[str, tuple[float, float]]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.readline()
+        f.seek(0)
+        reader = csv.DictReader(f, delimiter="\t" if "\t" in sample else ",")
+        # Gazetteer headers carry trailing whitespace on the last column.
+        reader.fieldnames = [name.strip() for name in reader.fieldnames or []]
+
+        centroids: dict[str, tuple[float, float]] = {}
+        for row in reader:
+            zip_code = _pick(row, ZIP_COLUMNS)
+            lat = _pick(row, LAT_COLUMNS)
+            lng = _pick(row, LNG_COLUMNS)
+            if not zip_code or not lat or not lng:
+                continue
+            try:
+                lat_f, lng_f = float(lat), float(lng)
+            except ValueError:
+                continue
+            if lat_f == 0 and lng_f == 0:
+                continue
+            centroids[zip_code.zfill(5)] = (lat_f, lng_f)
+    return centroids
+
+
+def write_centroids(centroids: dict[str, tuple[float, float]], output: Path) -> None:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(["zip", "lat", "lng"])
+    for zip_code in sorted(centroids):
+        lat, lng = centroids[zip_code]
+        writer.writerow([zip_code, f"{lat:.4f}", f"{lng:.4f}"])
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    # Blank name and mtime keep the output byte-identical across rebuilds.
+    with open(output, "wb") as raw, gzip.GzipFile(
+        filename="", mode="wb", fileobj=raw, mtime=0
+    ) as f:
+        f.write(buf.getvalue().encode("utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the zip centroid table")
+    parser.add_argument("source", type=Path, help="Gazetteer TSV or zip/lat/lng CSV")
+    parser.add_argument("--output", type=Path, default=ZIP_CENTROIDS_PATH)
+    args = parser.parse_args()
+
+    centroids = read_centroids(args.source)
+    if not centroids:
+        raise SystemExit(f"No zip centroids found in {args.source}")
+    write_centroids(centroids, args.output)
+    print(f"Wrote {len(centroids)} zip centroids to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
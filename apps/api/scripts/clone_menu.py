@@ -0,0 +1,90 @@
+"""
+Clone a restaurant's active menu to other locations.
+
+The whole copy runs server-side as a fixed number of INSERT ... SELECT
+statements in one transaction, however many targets there are.
+
+Usage:
+    python -m scripts.clone_menu nj/clinton/hunan-wok --chain
+    python -m scripts.clone_menu nj/clinton/hunan-wok --to nj/flemington/hunan-wok
+    python -m scripts.clone_menu nj/clinton/hunan-wok --location 3f0c...e1 --location 9a2b...07
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import select
+
+from app.database import async_session_maker
+from app.models import RestaurantSlug
+from app.services.menu import clone_menu
+
+
+def parse_path(path: str) -> tuple[str, str, str]:
+    parts = path.strip("/").lower().split("/")
+    if len(parts) != 3 or not all(parts):
+        raise SystemExit(f"Expected state/city/slug, got {path!r}")
+    return parts[0], parts[1], parts[2]
+
+
+async def resolve_paths(paths: list[tuple[str, str, str]]) -> list[uuid.UUID]:
+    location_ids = []
+    async with async_session_maker() as session:
+        for state_slug, city_slug, restaurant_slug in paths:
+            result = await session.execute(
+                select(RestaurantSlug.restaurant_location_id).where(
+                    RestaurantSlug.state_slug == state_slug,
+                    RestaurantSlug.city_slug == city_slug,
+                    RestaurantSlug.restaurant_slug == restaurant_slug,
+                    RestaurantSlug.is_canonical.is_(True),
+                )
+            )
+            location_id = result.scalar_one_or_none()
+            if location_id is None:
+                raise SystemExit(
+                    f"Restaurant not found: {state_slug}/{city_slug}/{restaurant_slug}"
+                )
+            location_ids.append(location_id)
+    return location_ids
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Clone a menu to other locations")
+    parser.add_argument("source", help="Source restaurant as state/city/slug")
+    parser.add_argument(
+        "--to", action="append", default=[], help="Target restaurant as state/city/slug"
+    )
+    parser.add_argument(
+        "--location", action="append", default=[], type=uuid.UUID, help="Target location id"
+    )
+    parser.add_argument(
+        "--chain",
+        action="store_true",
+        help="Also target every other location of the source's restaurant",
+    )
+    args = parser.parse_args()
+
+    if not (args.to or args.location or args.chain):
+        raise SystemExit("Provide --to, --location or --chain")
+
+    source = parse_path(args.source)
+    location_ids = args.location + await resolve_paths([parse_path(path) for path in args.to])
+
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        try:
+            result = await clone_menu(session, *source, location_ids, chain=args.chain)
+        except (LookupError, ValueError) as exc:
+            raise SystemExit(str(exc)) from exc
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"Cloned menu {result.source_menu_id} to {len(result.menus)} locations "
+        f"in {elapsed:.2f}s."
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,239 @@
+"""
+Geohash-blocked fuzzy duplicate detection for restaurant imports.
+
+The exact dedupe keys in scripts.import_restaurants miss near matches such as
+"123 Main St" vs "123 Main Street" or "Hunan Wok" vs "Hunan Wok Restaurant".
+Scoring every pair would be quadratic, so locations are bucketed by geohash
+cell (about 150 m square at precision 7) and a new location is only scored
+against the locations in its own and the eight surrounding cells. Each lookup
+touches a handful of candidates, so the whole pass is linear in the number of
+rows. Locations without coordinates fall back to one block per zip code, and
+are compared with every location in that zip, with or without coordinates.
+
+Names and addresses are normalized (case, punctuation, street suffixes,
+filler words) and compared with difflib. Two locations with different house
+numbers never match.
+"""
+
+import csv
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from pathlib import Path
+
+GEOHASH_PRECISION = 7
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+DEFAULT_THRESHOLD = 0.85
+
+STREET_WORDS = {
+    "street": "st", "str": "st", "avenue": "ave", "av": "ave", "road": "rd",
+    "boulevard": "blvd", "drive": "dr", "lane": "ln", "court": "ct", "place": "pl",
+    "highway": "hwy", "parkway": "pkwy", "terrace": "ter", "circle": "cir",
+    "square": "sq", "plaza": "plz", "route": "rte", "turnpike": "tpke", "suite": "ste",
+    "north": "n", "south": "s", "east": "e", "west": "w",
+}
+NAME_FILLER = {"the", "restaurant", "restaurants", "inc", "llc", "co", "and"}
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _bits(precision: int) -> tuple[int, int]:
+    """(lat, lng) bits in a geohash; longitude takes the odd bit."""
+    return 5 * precision // 2, (5 * precision + 1) // 2
+
+
+def geohash_cell(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> tuple[int, int]:
+    """(row, column) of the geohash cell containing the point.
+
+    Blocks are keyed by these integers rather than the geohash string, so
+    neighbouring cells are found by adding one instead of re-encoding.
+    """
+    lat_bits, lng_bits = _bits(precision)
+    row = min(int((lat + 90.0) / 180.0 * (1 << lat_bits)), (1 << lat_bits) - 1)
+    column = min(int((lng + 180.0) / 360.0 * (1 << lng_bits)), (1 << lng_bits) - 1)
+    return row, column
+
+
+def geohash(cell: tuple[int, int], precision: int = GEOHASH_PRECISION) -> str:
+    """The geohash string of a cell: its bits interleaved, longitude first."""
+    lat_bits, lng_bits = _bits(precision)
+    row, column = cell
+    value = 0
+    for n in range(5 * precision):
+        if n % 2 == 0:
+            lng_bits -= 1
+            value = (value << 1) | ((column >> lng_bits) & 1)
+        else:
+            lat_bits -= 1
+            value = (value << 1) | ((row >> lat_bits) & 1)
+    return "".join(
+        GEOHASH_BASE32[(value >> shift) & 31] for shift in range(5 * (precision - 1), -1, -5)
+    )
+
+
+def normalize_name(name: str) -> str:
+    words = _NON_WORD_RE.sub(" ", name.lower().replace("&", " and ")).split()
+    kept = [word for word in words if word not in NAME_FILLER]
+    return " ".join(kept or words)
+
+
+def normalize_address(address: str) -> str:
+    words = _NON_WORD_RE.sub(" ", address.lower()).split()
+    return " ".join(STREET_WORDS.get(word, word) for word in words)
+
+
+def _ratio(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b).ratio() if a and b else 0.0
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Edit similarity, raised when every word of the shorter name is in the longer one."""
+    score = _ratio(a, b)
+    words_a, words_b = set(a.split()), set(b.split())
+    shorter = min(words_a, words_b, key=len)
+    if len(shorter) >= 2 and words_a & words_b == shorter:
+        score = max(score, 0.9)
+    return score
+
+
+@dataclass(slots=True)
+class Candidate:
+    name: str
+    address: str
+    house_number: str | None
+    # As shown in the merge report.
+    display_name: str
+    address1: str
+    zip: str
+    place_id: str | None
+    slug: str | None
+
+
+@dataclass(slots=True)
+class FuzzyMatch:
+    candidate: Candidate
+    score: float
+    name_score: float
+    address_score: float
+    block: tuple[int, int] | str
+
+
+def make_candidate(
+    name: str, address1: str, zip_code: str, place_id: str | None, slug: str | None
+) -> Candidate:
+    address = normalize_address(address1)
+    first = address.split(" ", 1)[0]
+    return Candidate(
+        name=normalize_name(name),
+        address=address,
+        house_number=first if first[:1].isdigit() else None,
+        display_name=name,
+        address1=address1,
+        zip=zip_code,
+        place_id=place_id,
+        slug=slug,
+    )
+
+
+class GeoIndex:
+    """Locations bucketed by geohash cell (or zip, without coordinates)."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, precision: int = GEOHASH_PRECISION):
+        self.threshold = threshold
+        self.precision = precision
+        self.blocks: dict[tuple[int, int] | str, list[Candidate]] = {}
+        # Located candidates again by zip, for rows that have no coordinates.
+        self.located_by_zip: dict[str, list[Candidate]] = {}
+
+    def _nearby(
+        self, lat: float | None, lng: float | None, zip_code: str
+    ) -> Iterator[tuple[tuple[int, int] | str, list[Candidate]]]:
+        """(block, candidates) pairs a row at this position is scored against."""
+        zip_block = f"zip:{zip_code}"
+        # Candidates without coordinates are only found through their zip, so
+        # every row searches it.
+        yield zip_block, self.blocks.get(zip_block, [])
+        if lat is None or lng is None:
+            yield zip_block, self.located_by_zip.get(zip_code, [])
+            return
+        row, column = geohash_cell(lat, lng, self.precision)
+        for drow in (-1, 0, 1):
+            for dcolumn in (-1, 0, 1):
+                cell = (row + drow, column + dcolumn)
+                yield cell, self.blocks.get(cell, [])
+
+    def add(self, candidate: Candidate, lat: float | None, lng: float | None) -> None:
+        if lat is None or lng is None:
+            self.blocks.setdefault(f"zip:{candidate.zip}", []).append(candidate)
+            return
+        self.blocks.setdefault(geohash_cell(lat, lng, self.precision), []).append(candidate)
+        self.located_by_zip.setdefault(candidate.zip, []).append(candidate)
+
+    def match(
+        self, candidate: Candidate, lat: float | None, lng: float | None
+    ) -> FuzzyMatch | None:
+        """Best-scoring nearby location at or above the threshold."""
+        best: FuzzyMatch | None = None
+        for block, others in self._nearby(lat, lng, candidate.zip):
+            for other in others:
+                if (
+                    candidate.house_number
+                    and other.house_number
+                    and candidate.house_number != other.house_number
+                ):
+                    continue
+                address_score = _ratio(candidate.address, other.address)
+                name_score = name_similarity(candidate.name, other.name)
+                score = (name_score + address_score) / 2
+                if score >= self.threshold and (best is None or score > best.score):
+                    best = FuzzyMatch(other, score, name_score, address_score, block)
+        return best
+
+
+REPORT_COLUMNS = [
+    "score", "name_score", "address_score", "block",
+    "name", "address1", "zip", "google_place_id",
+    "matched_name", "matched_address1", "matched_zip", "matched_google_place_id",
+    "matched_slug",
+]
+
+
+class MergeReport:
+    """CSV of skipped rows and the location each was judged a duplicate of."""
+
+    def __init__(self, path: Path, append: bool = False, precision: int = GEOHASH_PRECISION):
+        self.path = path
+        self.precision = precision
+        exists = append and path.exists() and path.stat().st_size > 0
+        self._file = open(path, "a" if exists else "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if not exists:
+            self._writer.writerow(REPORT_COLUMNS)
+        self.rows = 0
+
+    def write(self, incoming: Candidate, match: FuzzyMatch) -> None:
+        matched = match.candidate
+        self._writer.writerow([
+            f"{match.score:.3f}", f"{match.name_score:.3f}", f"{match.address_score:.3f}",
+            match.block if isinstance(match.block, str) else geohash(match.block, self.precision),
+            incoming.display_name, incoming.address1, incoming.zip, incoming.place_id or "",
+            matched.display_name, matched.address1, matched.zip, matched.place_id or "",
+            matched.slug or "",
+        ])
+        self.rows += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def concat_reports(parts: list[Path], path: Path) -> None:
+    """Merge per-partition reports into one, keeping a single header row."""
+    with open(path, "w", newline="", encoding="utf-8") as out:
+        csv.writer(out).writerow(REPORT_COLUMNS)
+        for part in parts:
+            if not part.exists():
+                continue
+            with open(part, newline="", encoding="utf-8") as f:
+                next(f, None)
+                out.writelines(f)
@@ -3,20 +3,95 @@ Import restaurants from CSV into the database.
 
 Usage:
     python -m scripts.import_restaurants [path_to_csv]
+    python -m scripts.import_restaurants [path_to_csv] --bulk [--batch-size 5000]
+    python -m scripts.import_restaurants [path_to_csv] --upsert
+    python -m scripts.import_restaurants [path_to_csv] [--bulk] --resume
+    python -m scripts.import_restaurants [path_to_csv] --workers 4
+    python -m scripts.import_restaurants [path_to_csv] --fuzzy [--merge-report merges.csv]
+    python -m scripts.import_restaurants --from-cache [cache_dir]
+    python -m scripts.import_restaurants [path_to_csv] --upsert --dry-run [--changes changes.csv]
     Default: /app/../data/sample_restaurants.csv
+
+Rows are committed in batches of --batch-size. After each commit the byte
+offset and line number just past the last committed row are written to a
+checkpoint file (default: <csv>.checkpoint), which is removed once the whole
+file has been imported. --resume seeks straight to the checkpointed offset.
+The CSV is streamed, so memory does not grow with the file.
+
+--bulk is for large files: dedupe keys and existing slugs are loaded into
+memory once, IDs are assigned client-side, and each batch is COPYed into
+staging tables and moved into place with one INSERT ... SELECT per table
+instead of several queries per row.
+
+--upsert (implies --bulk) also refreshes restaurants already in the database:
+rows are matched on google_place_id, and those whose content hash differs
+from the stored one are updated in place. Slugs never change on update.
+
+--workers N (implies --bulk) splits the file by state into N partition files
+and imports each in its own process. Slugs are unique per state and city, so
+partitions never contend for a slug. Each finished partition leaves a
+<part>.done file with its counts; --resume skips those partitions and
+continues the others from their checkpoints.
+
+--fuzzy (implies --bulk) also skips near duplicates of known locations, found
+by geohash-blocked name and address similarity (see scripts.fuzzy_dedupe), and
+lists each one with its match in a merge report CSV for review.
+
+--from-cache (implies --bulk) skips the CSV altogether: places are read from
+the Places API response cache written by scripts.fetch_restaurants_google,
+filtered and converted with its should_include and place_to_record, and fed
+to the bulk loader as column values.
+
+--dry-run runs the same dedupe against an in-memory snapshot of the database,
+inside a read-only transaction, and writes a summary and a CSV of the rows
+that would be inserted or updated instead of loading anything.
 """
 
+import argparse
 import asyncio
 import csv
+import hashlib
 import json
-import sys
+import multiprocessing
+import os
+import re
+import shutil
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable, Collection, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields, replace
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
 
 from slugify import slugify
-from sqlalchemy import select
+from sqlalchemy import select, true
+from sqlalchemy.ext.asyncio import AsyncConnection
 
+from app.cache import location_invalidations
 from app.database import async_session_maker
+from app.invalidation import publish_invalidation
 from app.models import Restaurant, RestaurantLocation, RestaurantSlug
+from scripts.fetch_restaurants_google import (
+    CACHE_DIR,
+    RestaurantRecord,
+    place_to_record,
+    should_include,
+)
+from scripts.fuzzy_dedupe import (
+    DEFAULT_THRESHOLD,
+    Candidate,
+    FuzzyMatch,
+    GeoIndex,
+    MergeReport,
+    concat_reports,
+    make_candidate,
+)
+
+ROW_BATCH_SIZE = 500
+BULK_BATCH_SIZE = 5000
 
 
 def parse_bool(value: str | None) -> bool | None:
@@ -36,6 +111,161 @@ def normalize_state(value: str | None) -> str | None:
     return normalized
 
 
+def restaurant_fields(row: dict) -> dict:
+    return {
+        "name": row["name"].strip(),
+        "phone": row.get("phone", "").strip() or None,
+        "website_url": row.get("website_url", "").strip() or None,
+        "google_place_id": row.get("google_place_id", "").strip() or None,
+        "rating": float(row["rating"]) if row.get("rating") else None,
+        "user_rating_count": int(row["user_rating_count"]) if row.get("user_rating_count") else None,
+        "price_level": row.get("price_level", "").strip() or None,
+        "google_maps_uri": row.get("google_maps_uri", "").strip() or None,
+    }
+
+
+def location_fields(row: dict, state_code: str, decode_hours: bool = True) -> dict:
+    hours_json = row.get("hours_json") or None
+    if hours_json is not None and decode_hours:
+        hours_json = json.loads(hours_json)
+    return {
+        "address1": row["address1"].strip(),
+        "address2": row.get("address2", "").strip() or None,
+        "city": row["city"].strip(),
+        "state": state_code,
+        "zip": row["zip"].strip(),
+        "lat": float(row["lat"]) if row.get("lat") else None,
+        "lng": float(row["lng"]) if row.get("lng") else None,
+        "hours_json": hours_json,
+        "has_takeout": parse_bool(row.get("has_takeout")),
+        "has_delivery": parse_bool(row.get("has_delivery")),
+        "has_dine_in": parse_bool(row.get("has_dine_in")),
+        "business_status": row.get("business_status", "").strip() or None,
+    }
+
+
+@lru_cache(maxsize=65536)
+def _slugify(text: str) -> str:
+    # City and chain names repeat heavily across a national file.
+    return slugify(text)
+
+
+def slug_base(state: str, city: str, name: str) -> tuple[str, str, str]:
+    """(state_slug, city_slug, restaurant_slug) before collision handling."""
+    return state.strip().lower(), _slugify(city.strip()), _slugify(name.strip())
+
+
+def content_hash(restaurant: dict, location: dict) -> str:
+    """Fingerprint of the imported fields (hours_json as raw JSON text)."""
+    payload = json.dumps([restaurant, location], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ImportStats:
+    imported: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    skipped_invalid_state: int = 0
+    fuzzy_duplicates: int = 0
+    # Places cache only: excluded by should_include, or lacking a full address.
+    filtered: int = 0
+    incomplete: int = 0
+
+    def add(self, other: "ImportStats") -> None:
+        for stat in fields(self):
+            setattr(self, stat.name, getattr(self, stat.name) + getattr(other, stat.name))
+
+    def take(self) -> "ImportStats":
+        """Move these counts to a new ImportStats, leaving zeros behind."""
+        taken = replace(self)
+        for stat in fields(self):
+            setattr(self, stat.name, 0)
+        return taken
+
+
+class CsvStream:
+    """Dict rows from a CSV opened in binary mode, one row at a time.
+
+    `position` is the (byte offset, line number) just past the last row
+    returned, so a later run can seek straight back to it. Quoted fields
+    spanning several lines are handled by the csv module as usual.
+    """
+
+    def __init__(self, f: BinaryIO, offset: int = 0, line: int = 0):
+        header = f.readline()
+        self.fieldnames = next(csv.reader([header.decode("utf-8")]))
+        self.offset, self.line = len(header), 1
+        if offset > self.offset:
+            f.seek(offset)
+            self.offset, self.line = offset, line
+        self._file = f
+        self._reader = csv.DictReader(self._lines(), fieldnames=self.fieldnames)
+
+    def _lines(self) -> Iterator[str]:
+        # csv pulls only the lines it needs for the next row.
+        for raw in self._file:
+            self.offset += len(raw)
+            self.line += 1
+            yield raw.decode("utf-8")
+
+    def __iter__(self) -> "CsvStream":
+        return self
+
+    def __next__(self) -> dict:
+        return next(self._reader)
+
+    @property
+    def position(self) -> tuple[int, int]:
+        return self.offset, self.line
+
+
+@dataclass
+class Checkpoint:
+    """Where the last committed batch ended, persisted as JSON."""
+
+    csv_path: str
+    offset: int = 0
+    line: int = 0
+
+    @classmethod
+    def load(cls, path: Path, csv_path: str) -> "Checkpoint":
+        checkpoint = cls(**json.loads(path.read_text()))
+        if checkpoint.csv_path != csv_path:
+            raise SystemExit(f"{path} belongs to {checkpoint.csv_path}, not {csv_path}")
+        if checkpoint.offset > os.path.getsize(csv_path):
+            raise SystemExit(f"{path} points past the end of {csv_path}; was the file replaced?")
+        return checkpoint
+
+    def save(self, path: Path, position: tuple[int, int]) -> None:
+        self.offset, self.line = position
+        # Write then rename, so a crash never leaves a torn checkpoint.
+        tmp = path.with_name(f"{path.name}.tmp")
+        tmp.write_text(json.dumps(asdict(self)))
+        os.replace(tmp, path)
+
+
+def start_checkpoint(
+    csv_path: str, checkpoint_path: Path, resume: bool, label: str = ""
+) -> Checkpoint:
+    if resume and checkpoint_path.exists():
+        checkpoint = Checkpoint.load(checkpoint_path, csv_path)
+        print(f"  {label}Resuming at line {checkpoint.line} (byte {checkpoint.offset})")
+        return checkpoint
+    if resume:
+        print(f"  {label}No checkpoint at {checkpoint_path}; starting from the beginning")
+    return Checkpoint(csv_path)
+
+
+def report_stop(checkpoint: Checkpoint) -> None:
+    if checkpoint.line:
+        print(
+            f"\nImport stopped. Rows up to line {checkpoint.line} are committed; "
+            "re-run with --resume to continue."
+        )
+
+
 async def find_duplicate_location(session, row: dict) -> bool:
     """Check for duplicate by google_place_id OR (phone + address1 + zip) OR (name + address1 + zip)."""
     # Check by google_place_id (most reliable)
@@ -83,9 +313,7 @@ async def generate_unique_slug(
     session, state: str, city: str, name: str
 ) -> tuple[str, str, str]:
     """Generate unique (state_slug, city_slug, restaurant_slug) with collision handling."""
-    state_slug = state.strip().lower()
-    city_slug = slugify(city.strip())
-    base_slug = slugify(name.strip())
+    state_slug, city_slug, base_slug = slug_base(state, city, name)
     candidate = base_slug
     counter = 2
 
@@ -103,85 +331,1109 @@ async def generate_unique_slug(
         counter += 1
 
 
-async def import_csv(csv_path: str) -> None:
-    imported = 0
-    skipped = 0
-    skipped_invalid_state = 0
+async def import_row(session, row: dict, stats: ImportStats) -> tuple[str, str, str] | None:
+    """Insert one CSV row; returns its slug, or None if the row was skipped."""
+    state_code = normalize_state(row.get("state"))
+    if not state_code:
+        print(f"  Skipped (invalid state): {row.get('name', '?')} state={row.get('state', '')!r}")
+        stats.skipped += 1
+        stats.skipped_invalid_state += 1
+        return None
+
+    # Dedup check
+    if await find_duplicate_location(session, row):
+        print(f"  Skipped (duplicate): {row['name']} at {row['address1']}")
+        stats.skipped += 1
+        return None
+
+    # Create restaurant
+    fields = restaurant_fields(row)
+    restaurant = Restaurant(
+        **fields,
+        content_hash=content_hash(fields, location_fields(row, state_code, decode_hours=False)),
+    )
+    session.add(restaurant)
+    await session.flush()
+
+    # Create location
+    location = RestaurantLocation(restaurant_id=restaurant.id, **location_fields(row, state_code))
+    session.add(location)
+    await session.flush()
+
+    # Generate slug
+    state_slug, city_slug, restaurant_slug = await generate_unique_slug(
+        session, state_code, row["city"], row["name"]
+    )
+    slug = RestaurantSlug(
+        restaurant_location_id=location.id,
+        state_slug=state_slug,
+        city_slug=city_slug,
+        restaurant_slug=restaurant_slug,
+        is_canonical=True,
+    )
+    session.add(slug)
+    stats.imported += 1
+    print(f"  Imported: /{state_slug}/{city_slug}/{restaurant_slug}")
+    return state_slug, city_slug, restaurant_slug
+
+
+async def import_csv(
+    csv_path: str, batch_size: int, checkpoint_path: Path, resume: bool = False
+) -> None:
+    stats = ImportStats()
+    checkpoint = start_checkpoint(csv_path, checkpoint_path, resume)
+
+    try:
+        async with async_session_maker() as session:
+            with open(csv_path, "rb") as f:
+                stream = CsvStream(f, checkpoint.offset, checkpoint.line)
+                finished = False
+                while not finished:
+                    imported_slugs: list[tuple[str, str, str]] = []
+                    async with session.begin():
+                        finished = True
+                        for count, row in enumerate(stream, 1):
+                            slug = await import_row(session, row, stats)
+                            if slug is not None:
+                                imported_slugs.append(slug)
+                            if count >= batch_size:
+                                finished = False
+                                break
+
+                        # Delivered to every API worker only if the batch commits.
+                        keys, prefixes = location_invalidations(imported_slugs)
+                        await publish_invalidation(session, keys=keys, prefixes=prefixes)
+                    checkpoint.save(checkpoint_path, stream.position)
+    except BaseException:
+        report_stop(checkpoint)
+        raise
+    checkpoint_path.unlink(missing_ok=True)
+
+    print(f"\nDone. Imported {stats.imported}, skipped {stats.skipped}.")
+    if stats.skipped_invalid_state:
+        print(f"  Skipped invalid state rows: {stats.skipped_invalid_state}")
+
+
+# ---------------------------------------------------------------------------
+# Bulk mode
+# ---------------------------------------------------------------------------
+
+RESTAURANT_COLUMNS = (
+    "id", "name", "phone", "website_url", "google_place_id", "rating",
+    "user_rating_count", "price_level", "google_maps_uri", "content_hash",
+)
+LOCATION_COLUMNS = (
+    "id", "restaurant_id", "address1", "address2", "city", "state", "zip", "lat",
+    "lng", "hours_json", "has_takeout", "has_delivery", "has_dine_in", "business_status",
+)
+SLUG_COLUMNS = (
+    "id", "restaurant_location_id", "state_slug", "city_slug", "restaurant_slug", "is_canonical",
+)
+
+# Staging table -> target table, loaded in this order (foreign keys).
+STAGING_TABLES = {
+    "stage_restaurants": "restaurants",
+    "stage_locations": "restaurant_locations",
+    "stage_slugs": "restaurant_slugs",
+}
+
+
+def dedupe_keys(restaurant: dict, location: dict) -> tuple[str | None, tuple | None, tuple]:
+    """(google_place_id, phone key, name key) as compared by find_duplicate_location."""
+    address1, zip_code = location["address1"], location["zip"]
+    phone = restaurant["phone"]
+    phone_key = (phone, address1, zip_code) if phone else None
+    return restaurant["google_place_id"], phone_key, (restaurant["name"], address1, zip_code)
+
+
+@dataclass
+class ExistingPlace:
+    restaurant_id: uuid.UUID
+    location_id: uuid.UUID
+    content_hash: str | None
+    slug: tuple[str, str, str]
+    # Non-canonical slugs of the location; pages are cached under these too.
+    aliases: list[tuple[str, str, str]] = field(default_factory=list)
+
+    @property
+    def slugs(self) -> list[tuple[str, str, str]]:
+        return [self.slug, *self.aliases]
+
+
+@dataclass
+class ImportIndex:
+    """In-memory copy of everything the row-by-row path looks up per row.
+
+    Rows accepted during the import are added too, so duplicates within the
+    file are caught just as the per-row path catches them after a flush.
+    """
+
+    place_ids: set[str] = field(default_factory=set)
+    phone_keys: set[tuple[str, str, str]] = field(default_factory=set)
+    name_keys: set[tuple[str, str, str]] = field(default_factory=set)
+    slugs: set[tuple[str, str, str]] = field(default_factory=set)
+    # Upsert only: restaurants in the database by google_place_id, and the
+    # ones already refreshed during this run.
+    places: dict[str, ExistingPlace] = field(default_factory=dict)
+    refreshed: set[str] = field(default_factory=set)
+    # Fuzzy dedupe only: every known location, blocked by geohash.
+    geo: GeoIndex | None = None
+
+    @classmethod
+    async def load(
+        cls,
+        conn: AsyncConnection,
+        with_places: bool = False,
+        states: Collection[str] | None = None,
+        geo: GeoIndex | None = None,
+    ) -> "ImportIndex":
+        """Load the index; `states` limits the address keys and slugs to those states.
+
+        Place IDs are always loaded in full, since they are unique nationwide.
+        """
+        index = cls()
+        result = await conn.execute(
+            select(Restaurant.google_place_id).where(Restaurant.google_place_id.is_not(None))
+        )
+        index.place_ids.update(result.scalars())
+        in_states = RestaurantLocation.state.in_(states) if states is not None else true()
+        result = await conn.execute(
+            select(
+                Restaurant.phone,
+                Restaurant.name,
+                RestaurantLocation.address1,
+                RestaurantLocation.zip,
+            )
+            .join(RestaurantLocation, RestaurantLocation.restaurant_id == Restaurant.id)
+            .where(in_states)
+        )
+        for phone, name, address1, zip_code in result:
+            if phone:
+                index.phone_keys.add((phone, address1, zip_code))
+            index.name_keys.add((name, address1, zip_code))
+        result = await conn.execute(
+            select(
+                RestaurantSlug.state_slug,
+                RestaurantSlug.city_slug,
+                RestaurantSlug.restaurant_slug,
+            ).where(
+                RestaurantSlug.state_slug.in_([state.lower() for state in states])
+                if states is not None
+                else true()
+            )
+        )
+        index.slugs.update(tuple(slug) for slug in result)
+        if with_places:
+            result = await conn.execute(
+                select(
+                    Restaurant.google_place_id,
+                    Restaurant.id,
+                    RestaurantLocation.id,
+                    Restaurant.content_hash,
+                    RestaurantSlug.is_canonical,
+                    RestaurantSlug.state_slug,
+                    RestaurantSlug.city_slug,
+                    RestaurantSlug.restaurant_slug,
+                )
+                .join(RestaurantLocation, RestaurantLocation.restaurant_id == Restaurant.id)
+                .join(RestaurantSlug, RestaurantSlug.restaurant_location_id == RestaurantLocation.id)
+                .where(Restaurant.google_place_id.is_not(None), in_states)
+                # Canonical slugs first, so aliases find their place already indexed.
+                .order_by(RestaurantSlug.is_canonical.desc())
+            )
+            for place_id, restaurant_id, location_id, stored_hash, canonical, *slug in result:
+                if canonical:
+                    index.places.setdefault(
+                        place_id,
+                        ExistingPlace(restaurant_id, location_id, stored_hash, tuple(slug)),
+                    )
+                elif (place := index.places.get(place_id)) and place.location_id == location_id:
+                    place.aliases.append(tuple(slug))
+        if geo is not None:
+            result = await conn.execute(
+                select(
+                    Restaurant.name,
+                    RestaurantLocation.address1,
+                    RestaurantLocation.zip,
+                    RestaurantLocation.lat,
+                    RestaurantLocation.lng,
+                    Restaurant.google_place_id,
+                    RestaurantSlug.state_slug,
+                    RestaurantSlug.city_slug,
+                    RestaurantSlug.restaurant_slug,
+                )
+                .join(RestaurantLocation, RestaurantLocation.restaurant_id == Restaurant.id)
+                .outerjoin(
+                    RestaurantSlug,
+                    (RestaurantSlug.restaurant_location_id == RestaurantLocation.id)
+                    & RestaurantSlug.is_canonical.is_(True),
+                )
+                .where(in_states)
+            )
+            for name, address1, zip_code, lat, lng, place_id, *slug in result:
+                path = "/".join(slug) if slug[0] else None
+                geo.add(make_candidate(name, address1, zip_code, place_id, path), lat, lng)
+            index.geo = geo
+        return index
+
+    def is_duplicate(self, keys: tuple) -> bool:
+        place_id, phone_key, name_key = keys
+        return (
+            (place_id is not None and place_id in self.place_ids)
+            or (phone_key is not None and phone_key in self.phone_keys)
+            or name_key in self.name_keys
+        )
+
+    def add(self, keys: tuple) -> None:
+        place_id, phone_key, name_key = keys
+        if place_id is not None:
+            self.place_ids.add(place_id)
+        if phone_key is not None:
+            self.phone_keys.add(phone_key)
+        self.name_keys.add(name_key)
+
+    def claim_slug(self, state: str, city: str, name: str) -> tuple[str, str, str]:
+        """Same result as generate_unique_slug, without querying."""
+        state_slug, city_slug, base_slug = slug_base(state, city, name)
+        candidate = base_slug
+        counter = 2
+        while (state_slug, city_slug, candidate) in self.slugs:
+            candidate = f"{base_slug}-{counter}"
+            counter += 1
+        slug = (state_slug, city_slug, candidate)
+        self.slugs.add(slug)
+        return slug
+
+
+@dataclass
+class BulkBatch:
+    restaurants: list[tuple] = field(default_factory=list)
+    locations: list[tuple] = field(default_factory=list)
+    slugs: list[tuple] = field(default_factory=list)
+    # Existing restaurant id -> what the index knew of it, for rows being refreshed.
+    refreshed: dict[uuid.UUID, ExistingPlace] = field(default_factory=dict)
+    # Source position just past the batch's last row, for checkpointing.
+    position: tuple[int, int] | None = None
+    # Rows skipped as fuzzy duplicates, reported once the batch commits.
+    merges: list[tuple[Candidate, FuzzyMatch]] = field(default_factory=list)
+    # Rows skipped or unchanged while this batch was read.
+    stats: ImportStats = field(default_factory=ImportStats)
+
+    def __len__(self) -> int:
+        return len(self.restaurants)
+
+    def add(
+        self,
+        restaurant: dict,
+        location: dict,
+        slug: tuple[str, str, str],
+        existing: ExistingPlace | None = None,
+    ) -> None:
+        if existing is None:
+            restaurant_id, location_id = uuid.uuid4(), uuid.uuid4()
+            self.slugs.append((uuid.uuid4(), location_id, *slug, True))
+        else:
+            restaurant_id, location_id = existing.restaurant_id, existing.location_id
+            self.refreshed[restaurant_id] = existing
+        self.restaurants.append(
+            (restaurant_id, *(restaurant[column] for column in RESTAURANT_COLUMNS[1:]))
+        )
+        self.locations.append(
+            (location_id, restaurant_id, *(location[column] for column in LOCATION_COLUMNS[2:]))
+        )
+
+
+def _assignments(columns: tuple[str, ...]) -> str:
+    return ", ".join(f"{column} = EXCLUDED.{column}" for column in columns) + ", updated_at = now()"
+
+
+async def write_batch(
+    conn: AsyncConnection, batch: BulkBatch, upsert: bool = False
+) -> tuple[list[tuple[str, str, str]], list[ExistingPlace]]:
+    """COPY a batch into staging tables and apply it.
+
+    Returns the slugs of inserted restaurants and the updated places. Without upsert,
+    a restaurant whose google_place_id was inserted by someone else since the
+    index was loaded is dropped by ON CONFLICT, along with its location and
+    slug. With upsert, a matching restaurant is updated only if its content
+    hash changed.
+    """
+    # Through SQLAlchemy first: the asyncpg adapter opens its transaction
+    # lazily, and raw driver calls made before that would autocommit.
+    for staging, target in STAGING_TABLES.items():
+        await conn.exec_driver_sql(
+            f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+            f"(LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        await conn.exec_driver_sql(f"TRUNCATE {staging}")
+    raw = (await conn.get_raw_connection()).driver_connection
+
+    await raw.copy_records_to_table(
+        "stage_restaurants", records=batch.restaurants, columns=RESTAURANT_COLUMNS
+    )
+    await raw.copy_records_to_table(
+        "stage_locations", records=batch.locations, columns=LOCATION_COLUMNS
+    )
+    await raw.copy_records_to_table("stage_slugs", records=batch.slugs, columns=SLUG_COLUMNS)
+
+    restaurant_columns = ", ".join(RESTAURANT_COLUMNS)
+    if upsert:
+        conflict = (
+            f"ON CONFLICT (google_place_id) DO UPDATE SET {_assignments(RESTAURANT_COLUMNS[1:])} "
+            "WHERE restaurants.content_hash IS DISTINCT FROM EXCLUDED.content_hash"
+        )
+    else:
+        conflict = "ON CONFLICT DO NOTHING"
+    # xmax is 0 only for freshly inserted row versions.
+    written = await raw.fetch(
+        f"INSERT INTO restaurants ({restaurant_columns}) "
+        f"SELECT {restaurant_columns} FROM stage_restaurants {conflict} "
+        "RETURNING id, xmax = 0 AS inserted"
+    )
+    written_ids = [record["id"] for record in written]
+    inserted_ids = {record["id"] for record in written if record["inserted"]}
+
+    location_columns = ", ".join(LOCATION_COLUMNS)
+    await raw.execute(
+        f"INSERT INTO restaurant_locations ({location_columns}) "
+        f"SELECT {', '.join(f'l.{column}' for column in LOCATION_COLUMNS)} "
+        "FROM stage_locations l JOIN unnest($1::uuid[]) AS w(id) ON w.id = l.restaurant_id "
+        f"ON CONFLICT (id) DO UPDATE SET {_assignments(LOCATION_COLUMNS[2:])}",
+        written_ids,
+    )
+    slug_columns = ", ".join(SLUG_COLUMNS)
+    await raw.execute(
+        f"INSERT INTO restaurant_slugs ({slug_columns}) "
+        f"SELECT {', '.join(f's.{column}' for column in SLUG_COLUMNS)} "
+        "FROM stage_slugs s JOIN stage_locations l ON l.id = s.restaurant_location_id "
+        "JOIN unnest($1::uuid[]) AS w(id) ON w.id = l.restaurant_id",
+        list(inserted_ids),
+    )
+
+    location_ids = {location[0]: location[1] for location in batch.locations}
+    inserted = [
+        tuple(slug[2:5]) for slug in batch.slugs if location_ids[slug[1]] in inserted_ids
+    ]
+    updated = [
+        batch.refreshed[restaurant_id]
+        for restaurant_id in written_ids
+        if restaurant_id not in inserted_ids and restaurant_id in batch.refreshed
+    ]
+    return inserted, updated
+
+
+def csv_records(rows, stats: ImportStats) -> Iterator[tuple[dict, dict]]:
+    """(restaurant, location) column values for each CSV row with a valid state."""
+    for row in rows:
+        state_code = normalize_state(row.get("state"))
+        if not state_code:
+            stats.skipped += 1
+            stats.skipped_invalid_state += 1
+            continue
+        # The jsonb COPY codec takes JSON text, which Postgres validates.
+        yield restaurant_fields(row), location_fields(row, state_code, decode_hours=False)
+
+
+def read_batches(
+    records,
+    index: ImportIndex,
+    counts: ImportStats,
+    batch_size: int,
+    position: Callable[[], tuple[int, int]] | None = None,
+):
+    """Yield BulkBatches of new (restaurant, location) records, skipping duplicates.
 
+    With an index loaded `with_places`, records for restaurants already in the
+    database are batched as refreshes when their content hash changed. With
+    a `geo` index, new records close enough to a known location are skipped
+    and kept on the batch for the merge report.
+
+    `counts` is the tally `records` also writes its skips to. It is moved
+    onto each batch's `stats` as the batch is cut, so a consumer on another
+    thread can add them up without sharing counters with this generator.
+    """
+    batch = BulkBatch()
+    for restaurant, location in records:
+        keys = dedupe_keys(restaurant, location)
+        existing = index.places.get(keys[0]) if keys[0] is not None else None
+        if existing is not None:
+            if keys[0] in index.refreshed:
+                counts.skipped += 1
+                continue
+            index.refreshed.add(keys[0])
+            restaurant["content_hash"] = content_hash(restaurant, location)
+            if restaurant["content_hash"] == existing.content_hash:
+                counts.unchanged += 1
+                continue
+            batch.add(restaurant, location, existing.slug, existing)
+        elif index.is_duplicate(keys):
+            counts.skipped += 1
+            continue
+        else:
+            restaurant["content_hash"] = content_hash(restaurant, location)
+            candidate = None
+            if index.geo is not None:
+                candidate = make_candidate(
+                    restaurant["name"], location["address1"], location["zip"],
+                    restaurant["google_place_id"], None,
+                )
+                match = index.geo.match(candidate, location["lat"], location["lng"])
+                if match is not None:
+                    counts.skipped += 1
+                    counts.fuzzy_duplicates += 1
+                    batch.merges.append((candidate, match))
+                    continue
+
+            index.add(keys)
+            slug = index.claim_slug(location["state"], location["city"], restaurant["name"])
+            if candidate is not None:
+                candidate.slug = "/".join(slug)
+                index.geo.add(candidate, location["lat"], location["lng"])
+            batch.add(restaurant, location, slug)
+        if len(batch) >= batch_size:
+            batch.position = position() if position else None
+            batch.stats = counts.take()
+            yield batch
+            batch = BulkBatch()
+    # Always yielded: the tail may hold only skipped rows worth checkpointing.
+    batch.position = position() if position else None
+    batch.stats = counts.take()
+    yield batch
+
+
+async def bulk_load(
+    records: Iterator[tuple[dict, dict]],
+    counts: ImportStats,
+    stats: ImportStats,
+    batch_size: int,
+    upsert: bool = False,
+    states: Collection[str] | None = None,
+    label: str = "",
+    fuzzy_threshold: float | None = None,
+    report: MergeReport | None = None,
+    position: Callable[[], tuple[int, int]] | None = None,
+    on_commit: Callable[[tuple[int, int]], None] | None = None,
+) -> None:
+    """Dedupe records against the database and load them batch by batch.
+
+    `records` counts its skips in `counts`, which only the reading thread
+    touches; totals go to `stats`. Each batch commits on its own;
+    `on_commit` then receives the `position` recorded when the batch was cut.
+    """
+    started = time.perf_counter()
     async with async_session_maker() as session:
         async with session.begin():
-            with open(csv_path, newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    state_code = normalize_state(row.get("state"))
-                    if not state_code:
-                        print(f"  Skipped (invalid state): {row.get('name', '?')} state={row.get('state', '')!r}")
-                        skipped += 1
-                        skipped_invalid_state += 1
-                        continue
-
-                    # Dedup check
-                    if await find_duplicate_location(session, row):
-                        print(f"  Skipped (duplicate): {row['name']} at {row['address1']}")
-                        skipped += 1
-                        continue
-
-                    # Create restaurant
-                    restaurant = Restaurant(
-                        name=row["name"].strip(),
-                        phone=row.get("phone", "").strip() or None,
-                        website_url=row.get("website_url", "").strip() or None,
-                        google_place_id=row.get("google_place_id", "").strip() or None,
-                        rating=float(row["rating"]) if row.get("rating") else None,
-                        user_rating_count=int(row["user_rating_count"]) if row.get("user_rating_count") else None,
-                        price_level=row.get("price_level", "").strip() or None,
-                        google_maps_uri=row.get("google_maps_uri", "").strip() or None,
-                    )
-                    session.add(restaurant)
-                    await session.flush()
-
-                    # Create location
-                    location = RestaurantLocation(
-                        restaurant_id=restaurant.id,
-                        address1=row["address1"].strip(),
-                        address2=row.get("address2", "").strip() or None,
-                        city=row["city"].strip(),
-                        state=state_code,
-                        zip=row["zip"].strip(),
-                        lat=float(row["lat"]) if row.get("lat") else None,
-                        lng=float(row["lng"]) if row.get("lng") else None,
-                        hours_json=json.loads(row["hours_json"]) if row.get("hours_json") else None,
-                        has_takeout=parse_bool(row.get("has_takeout")),
-                        has_delivery=parse_bool(row.get("has_delivery")),
-                        has_dine_in=parse_bool(row.get("has_dine_in")),
-                        business_status=row.get("business_status", "").strip() or None,
-                    )
-                    session.add(location)
-                    await session.flush()
+            index = await ImportIndex.load(
+                await session.connection(),
+                with_places=upsert,
+                states=states,
+                geo=GeoIndex(fuzzy_threshold) if fuzzy_threshold is not None else None,
+            )
+        print(
+            f"  {label}Loaded {len(index.place_ids)} place IDs, {len(index.name_keys)} "
+            f"location keys and {len(index.slugs)} slugs"
+        )
+
+        async def write(batch: BulkBatch) -> None:
+            # One transaction per batch; invalidations go out with its commit.
+            async with session.begin():
+                inserted, updated = await write_batch(await session.connection(), batch, upsert)
+                refreshed_slugs = [slug for place in updated for slug in place.slugs]
+                keys, prefixes = location_invalidations([*inserted, *refreshed_slugs])
+                await publish_invalidation(session, keys=keys, prefixes=prefixes)
+            if on_commit is not None and batch.position is not None:
+                on_commit(batch.position)
+            if report is not None:
+                for candidate, match in batch.merges:
+                    report.write(candidate, match)
+
+            new_rows = len(batch) - len(batch.refreshed)
+            stats.imported += len(inserted)
+            stats.updated += len(updated)
+            stats.skipped += new_rows - len(inserted)
+            # Rows whose hash was refreshed by someone else meanwhile.
+            stats.unchanged += len(batch.refreshed) - len(updated)
+            rate = (stats.imported + stats.updated) / (time.perf_counter() - started)
+            print(
+                f"  {label}Imported {stats.imported}, updated {stats.updated}, "
+                f"skipped {stats.skipped} ({rate:,.0f} rows/s)"
+            )
+
+        batches = read_batches(records, index, counts, batch_size, position)
+        pending: asyncio.Task | None = None
+        try:
+            while True:
+                # Parse the next batch in a thread while Postgres loads the previous one.
+                batch = await asyncio.to_thread(next, batches, None)
+                if pending is not None:
+                    await pending
+                    pending = None
+                if batch is None:
+                    break
+                # Added here, on the loop thread, like write()'s own counts.
+                stats.add(batch.stats)
+                pending = asyncio.create_task(write(batch))
+        finally:
+            # Never leave a COPY running on the session as it closes.
+            if pending is not None:
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+
+
+async def import_csv_bulk(
+    csv_path: str,
+    batch_size: int,
+    checkpoint_path: Path,
+    resume: bool = False,
+    upsert: bool = False,
+    states: Collection[str] | None = None,
+    label: str = "",
+    fuzzy_threshold: float | None = None,
+    merge_report: Path | None = None,
+) -> ImportStats:
+    stats, counts = ImportStats(), ImportStats()
+    checkpoint = start_checkpoint(csv_path, checkpoint_path, resume, label)
+    report = None
+    if fuzzy_threshold is not None:
+        report = MergeReport(merge_report or Path(f"{csv_path}.merges.csv"), append=resume)
+
+    try:
+        with open(csv_path, "rb") as f:
+            stream = CsvStream(f, checkpoint.offset, checkpoint.line)
+            await bulk_load(
+                csv_records(stream, counts),
+                counts,
+                stats,
+                batch_size,
+                upsert=upsert,
+                states=states,
+                label=label,
+                fuzzy_threshold=fuzzy_threshold,
+                report=report,
+                position=lambda: stream.position,
+                on_commit=lambda position: checkpoint.save(checkpoint_path, position),
+            )
+    except BaseException:
+        report_stop(checkpoint)
+        raise
+    finally:
+        if report is not None:
+            report.close()
+    checkpoint_path.unlink(missing_ok=True)
+    return stats
+
+
+def print_bulk_summary(
+    stats: ImportStats, elapsed: float, upsert: bool, merge_report: Path | None = None
+) -> None:
+    if upsert:
+        print(
+            f"\nDone. Inserted {stats.imported}, updated {stats.updated}, "
+            f"unchanged {stats.unchanged}, skipped {stats.skipped} in {elapsed:.1f}s."
+        )
+    else:
+        print(f"\nDone. Imported {stats.imported}, skipped {stats.skipped} in {elapsed:.1f}s.")
+    if stats.skipped_invalid_state:
+        print(f"  Skipped invalid state rows: {stats.skipped_invalid_state}")
+    if stats.filtered:
+        print(f"  Skipped filtered places: {stats.filtered}")
+    if stats.incomplete:
+        print(f"  Skipped places without a full address: {stats.incomplete}")
+    if merge_report is not None:
+        print(f"  Skipped fuzzy duplicates: {stats.fuzzy_duplicates} (see {merge_report})")
+
+
+# ---------------------------------------------------------------------------
+# Places cache source
+# ---------------------------------------------------------------------------
+
+
+def _text(value: str) -> str | None:
+    return value.strip() or None
+
+
+def record_fields(record: RestaurantRecord, state_code: str) -> tuple[dict, dict]:
+    """Column values for a fetched place, equal to what its CSV row would yield.
+
+    Keeping them equal keeps content hashes stable whichever source was used.
+    """
+    restaurant = {
+        "name": record.name.strip(),
+        "phone": _text(record.phone),
+        "website_url": _text(record.website_url),
+        "google_place_id": _text(record.place_id),
+        "rating": float(record.rating) if record.rating is not None else None,
+        "user_rating_count": record.user_rating_count,
+        "price_level": _text(record.price_level),
+        "google_maps_uri": _text(record.google_maps_uri),
+    }
+    location = {
+        "address1": record.address1.strip(),
+        "address2": _text(record.address2),
+        "city": record.city.strip(),
+        "state": state_code,
+        "zip": record.zip.strip(),
+        "lat": float(record.lat),
+        "lng": float(record.lng),
+        "hours_json": record.hours_json or None,
+        "has_takeout": record.has_takeout,
+        "has_delivery": record.has_delivery,
+        "has_dine_in": record.has_dine_in,
+        "business_status": _text(record.business_status),
+    }
+    return restaurant, location
+
+
+def cache_records(cache_dir: Path, stats: ImportStats) -> Iterator[tuple[dict, dict]]:
+    """Included places from cached Nearby Search responses, one file at a time.
+
+    Grid cells overlap, so a place is taken from the first file (in path
+    order) that contains it, as fetch_restaurants_google does per metro.
+    """
+    seen: set[str] = set()
+    for path in sorted(cache_dir.rglob("*.json")):
+        try:
+            places = json.loads(path.read_bytes()).get("response") or []
+        except (json.JSONDecodeError, AttributeError) as exc:
+            print(f"  Skipped unreadable cache file {path}: {exc}")
+            continue
+        for place in places:
+            place_id = place.get("id", "")
+            if place_id in seen:
+                continue
+            seen.add(place_id)
+
+            include, _ = should_include(place)
+            if not include:
+                stats.skipped += 1
+                stats.filtered += 1
+                continue
+            record = place_to_record(place)
+            if record is None:
+                stats.skipped += 1
+                stats.incomplete += 1
+                continue
+            state_code = normalize_state(record.state)
+            if not state_code:
+                stats.skipped += 1
+                stats.skipped_invalid_state += 1
+                continue
+            yield record_fields(record, state_code)
+
+
+async def import_cache_bulk(
+    cache_dir: Path,
+    batch_size: int,
+    upsert: bool = False,
+    fuzzy_threshold: float | None = None,
+    merge_report: Path | None = None,
+) -> ImportStats:
+    stats, counts = ImportStats(), ImportStats()
+    report = MergeReport(merge_report) if merge_report is not None else None
+    try:
+        await bulk_load(
+            cache_records(cache_dir, counts),
+            counts,
+            stats,
+            batch_size,
+            upsert=upsert,
+            fuzzy_threshold=fuzzy_threshold,
+            report=report,
+        )
+    finally:
+        if report is not None:
+            report.close()
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Dry run
+# ---------------------------------------------------------------------------
+
+CHANGE_COLUMNS = [
+    "action", "slug", "name", "address1", "city", "state", "zip", "google_place_id", "note",
+]
+
+
+def batch_changes(batch: BulkBatch) -> Iterator[list]:
+    """CSV rows describing what write_batch would do with a batch."""
+    new_slugs = {slug[1]: slug[2:5] for slug in batch.slugs}
+    for restaurant_row, location_row in zip(batch.restaurants, batch.locations):
+        restaurant = dict(zip(RESTAURANT_COLUMNS, restaurant_row))
+        location = dict(zip(LOCATION_COLUMNS, location_row))
+        note = ""
+        if restaurant["id"] in batch.refreshed:
+            action = "update"
+            slug = batch.refreshed[restaurant["id"]].slug
+            base = slug_base(location["state"], location["city"], restaurant["name"])
+            if slug[:2] != base[:2] or not re.fullmatch(rf"{re.escape(base[2])}(-\d+)?", slug[2]):
+                note = f"slug kept; name or city now gives {'/'.join(base)}"
+        else:
+            action = "insert"
+            slug = new_slugs[location["id"]]
+        yield [
+            action, "/".join(slug), restaurant["name"], location["address1"], location["city"],
+            location["state"], location["zip"], restaurant["google_place_id"] or "", note,
+        ]
+
+
+async def dry_run(
+    records: Iterator[tuple[dict, dict]],
+    counts: ImportStats,
+    stats: ImportStats,
+    changes_path: Path,
+    upsert: bool = False,
+    fuzzy_threshold: float | None = None,
+    report: MergeReport | None = None,
+) -> None:
+    """Count what an import would do and list its inserts and updates, without writing."""
+    async with async_session_maker() as session:
+        async with session.begin():
+            conn = await session.connection()
+            await conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+            index = await ImportIndex.load(
+                conn,
+                with_places=upsert,
+                geo=GeoIndex(fuzzy_threshold) if fuzzy_threshold is not None else None,
+            )
+
+    with open(changes_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CHANGE_COLUMNS)
+        for batch in read_batches(records, index, counts, BULK_BATCH_SIZE):
+            writer.writerows(batch_changes(batch))
+            stats.add(batch.stats)
+            stats.imported += len(batch) - len(batch.refreshed)
+            stats.updated += len(batch.refreshed)
+            if report is not None:
+                for candidate, match in batch.merges:
+                    report.write(candidate, match)
+
+
+def print_dry_run_summary(
+    stats: ImportStats,
+    elapsed: float,
+    upsert: bool,
+    changes_path: Path,
+    merge_report: Path | None = None,
+) -> None:
+    duplicates = stats.skipped - (
+        stats.skipped_invalid_state + stats.fuzzy_duplicates + stats.filtered + stats.incomplete
+    )
+    print(f"\nDry run finished in {elapsed:.1f}s; nothing was written.")
+    print(f"  New restaurants:    {stats.imported}")
+    if upsert:
+        print(f"  Updated:            {stats.updated}")
+        print(f"  Unchanged:          {stats.unchanged}")
+    print(f"  Duplicates:         {duplicates}")
+    if merge_report is not None:
+        print(f"  Fuzzy duplicates:   {stats.fuzzy_duplicates} (see {merge_report})")
+    print(f"  Invalid state rows: {stats.skipped_invalid_state}")
+    if stats.filtered or stats.incomplete:
+        print(f"  Filtered places:    {stats.filtered}")
+        print(f"  Incomplete places:  {stats.incomplete}")
+    print(f"  Changes: {changes_path}")
+
+
+# ---------------------------------------------------------------------------
+# Parallel mode
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Partition:
+    path: Path
+    states: set[str] = field(default_factory=set)
+    rows: int = 0
+
+    @property
+    def done_path(self) -> Path:
+        """Written with the partition's counts once it has been fully imported."""
+        return Path(f"{self.path}.done")
+
+
+def partition_csv(csv_path: str, parts_dir: Path, workers: int) -> list[Partition]:
+    """Split the CSV into per-worker files, keeping each state in one file.
+
+    A first pass counts rows per state; states are then dealt largest first
+    to the partition with the fewest rows. Rows with an invalid state go to
+    the first partition, which counts them as skipped.
+    """
+    with open(csv_path, "rb") as f:
+        state_rows = Counter(normalize_state(row.get("state")) for row in CsvStream(f))
+
+    partitions = [Partition(parts_dir / f"part-{n}.csv") for n in range(workers)]
+    owner: dict[str | None, Partition] = {None: partitions[0]}
+    partitions[0].rows = state_rows.pop(None, 0)
+    for state_code, rows in state_rows.most_common():
+        partition = owner[state_code] = min(partitions, key=lambda p: p.rows)
+        partition.states.add(state_code)
+        partition.rows += rows
+
+    shutil.rmtree(parts_dir, ignore_errors=True)
+    parts_dir.mkdir(parents=True)
+    with open(csv_path, "rb") as f:
+        stream = CsvStream(f)
+        files = {
+            id(partition): open(partition.path, "w", newline="", encoding="utf-8")
+            for partition in partitions
+        }
+        try:
+            writers = {
+                key: csv.DictWriter(out, stream.fieldnames, extrasaction="ignore")
+                for key, out in files.items()
+            }
+            for writer in writers.values():
+                writer.writeheader()
+            for row in stream:
+                writers[id(owner[normalize_state(row.get("state"))])].writerow(row)
+        finally:
+            for out in files.values():
+                out.close()
+    return partitions
+
+
+def load_partitions(parts_dir: Path) -> list[Partition]:
+    """Partitions written by an earlier run, with the states found in each."""
+    partitions = []
+    for path in sorted(parts_dir.glob("part-*.csv")):
+        partition = Partition(path)
+        with open(path, "rb") as f:
+            for row in CsvStream(f):
+                state_code = normalize_state(row.get("state"))
+                if state_code:
+                    partition.states.add(state_code)
+                partition.rows += 1
+        partitions.append(partition)
+    if not partitions:
+        raise SystemExit(f"No partitions in {parts_dir}")
+    return partitions
+
+
+def import_partition(
+    partition: Partition,
+    batch_size: int,
+    resume: bool,
+    upsert: bool,
+    fuzzy_threshold: float | None,
+) -> ImportStats:
+    """Worker process entry point: bulk-import one partition on its own connection."""
+    stats = asyncio.run(
+        import_csv_bulk(
+            str(partition.path),
+            batch_size,
+            Path(f"{partition.path}.checkpoint"),
+            resume=resume,
+            upsert=upsert,
+            states=partition.states,
+            label=f"[{partition.path.stem}] ",
+            fuzzy_threshold=fuzzy_threshold,
+        )
+    )
+    # import_csv_bulk has removed the checkpoint; this marker tells --resume
+    # the partition is finished rather than not yet started.
+    tmp = partition.done_path.with_name(f"{partition.done_path.name}.tmp")
+    tmp.write_text(json.dumps(asdict(stats)))
+    os.replace(tmp, partition.done_path)
+    return stats
+
+
+def import_csv_parallel(
+    csv_path: str,
+    batch_size: int,
+    workers: int,
+    resume: bool = False,
+    upsert: bool = False,
+    fuzzy_threshold: float | None = None,
+    merge_report: Path | None = None,
+) -> None:
+    started = time.perf_counter()
+    # Kept until every partition has finished, so --resume can pick them up.
+    parts_dir = Path(f"{csv_path}.parts")
+    if resume and parts_dir.is_dir():
+        partitions = load_partitions(parts_dir)
+        print(f"  Resuming {len(partitions)} partitions in {parts_dir}")
+    else:
+        partitions = partition_csv(csv_path, parts_dir, workers)
+    for partition in partitions:
+        print(f"  {partition.path.stem}: {partition.rows} rows, {len(partition.states)} states")
+
+    stats = ImportStats()
+    remaining = []
+    for partition in partitions:
+        if resume and partition.done_path.exists():
+            print(f"  {partition.path.stem}: already imported")
+            stats.add(ImportStats(**json.loads(partition.done_path.read_text())))
+        else:
+            remaining.append(partition)
+
+    failed = 0
+    # Spawned, not forked: each worker builds its own engine and event loop.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max(len(remaining), 1), mp_context=context) as pool:
+        futures = [
+            pool.submit(import_partition, partition, batch_size, resume, upsert, fuzzy_threshold)
+            for partition in remaining
+        ]
+        for partition, future in zip(remaining, futures):
+            try:
+                stats.add(future.result())
+            except Exception as exc:
+                failed += 1
+                print(f"  {partition.path.stem} failed: {exc!r}")
+    if failed:
+        raise SystemExit(
+            f"{failed} of {len(partitions)} partitions failed; re-run with --resume to continue."
+        )
+    if merge_report is not None:
+        parts = [Path(f"{partition.path}.merges.csv") for partition in partitions]
+        concat_reports(parts, merge_report)
+    shutil.rmtree(parts_dir)
+    print_bulk_summary(stats, time.perf_counter() - started, upsert, merge_report)
+
 
-                    # Generate slug
-                    state_slug, city_slug, restaurant_slug = await generate_unique_slug(
-                        session, state_code, row["city"], row["name"]
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import restaurants from CSV")
+    parser.add_argument(
+        "csv_path",
+        nargs="?",
+        default=str(
+            Path(__file__).resolve().parent.parent.parent.parent / "data" / "sample_restaurants.csv"
+        ),
+    )
+    parser.add_argument(
+        "--bulk", action="store_true", help="Preload dedupe keys and load batches with COPY"
+    )
+    parser.add_argument(
+        "--upsert",
+        action="store_true",
+        help="Bulk import that also updates existing restaurants whose data changed",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help=f"Rows per transaction (default {ROW_BATCH_SIZE}, or {BULK_BATCH_SIZE} with --bulk)",
+    )
+    parser.add_argument(
+        "--checkpoint", type=Path, help="Checkpoint file (default: <csv_path>.checkpoint)"
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="Continue from the checkpoint of an interrupted run"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Bulk-import partitions by state in N processes"
+    )
+    parser.add_argument(
+        "--fuzzy", action="store_true", help="Bulk import that also skips near-duplicate locations"
+    )
+    parser.add_argument(
+        "--fuzzy-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Similarity (0-1) at which a nearby location counts as a duplicate",
+    )
+    parser.add_argument(
+        "--merge-report", type=Path, help="Fuzzy duplicate report (default: <csv_path>.merges.csv)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what the import would do, writing nothing to the database",
+    )
+    parser.add_argument(
+        "--changes", type=Path, help="Dry-run change list (default: <csv_path>.changes.csv)"
+    )
+    parser.add_argument(
+        "--from-cache",
+        type=Path,
+        nargs="?",
+        const=CACHE_DIR,
+        metavar="CACHE_DIR",
+        help=f"Bulk import from the Places API response cache (default: {CACHE_DIR})",
+    )
+    args = parser.parse_args()
+    if args.workers > 1 and args.checkpoint:
+        parser.error("--checkpoint cannot be combined with --workers (each partition has its own)")
+    if args.from_cache and (args.workers > 1 or args.resume):
+        parser.error("--from-cache cannot be combined with --workers or --resume")
+    if args.dry_run and (args.workers > 1 or args.resume):
+        parser.error("--dry-run cannot be combined with --workers or --resume")
+
+    source = args.from_cache or Path(args.csv_path)
+    csv_path = str(source.resolve())
+    checkpoint_path = args.checkpoint or Path(f"{csv_path}.checkpoint")
+    fuzzy_threshold = args.fuzzy_threshold if args.fuzzy else None
+    merge_report = (args.merge_report or Path(f"{csv_path}.merges.csv")) if args.fuzzy else None
+    print(f"Importing from: {csv_path}")
+    if args.dry_run:
+        started = time.perf_counter()
+        stats, counts = ImportStats(), ImportStats()
+        changes_path = args.changes or Path(f"{csv_path}.changes.csv")
+        report = MergeReport(merge_report) if merge_report is not None else None
+        try:
+            if args.from_cache:
+                records = cache_records(args.from_cache, counts)
+                asyncio.run(
+                    dry_run(
+                        records, counts, stats, changes_path, args.upsert, fuzzy_threshold, report
                     )
-                    slug = RestaurantSlug(
-                        restaurant_location_id=location.id,
-                        state_slug=state_slug,
-                        city_slug=city_slug,
-                        restaurant_slug=restaurant_slug,
-                        is_canonical=True,
+                )
+            else:
+                with open(csv_path, "rb") as f:
+                    records = csv_records(CsvStream(f), counts)
+                    asyncio.run(
+                        dry_run(
+                            records, counts, stats, changes_path, args.upsert, fuzzy_threshold,
+                            report,
+                        )
                     )
-                    session.add(slug)
-                    imported += 1
-                    print(f"  Imported: /{state_slug}/{city_slug}/{restaurant_slug}")
-
-    print(f"\nDone. Imported {imported}, skipped {skipped}.")
-    if skipped_invalid_state:
-        print(f"  Skipped invalid state rows: {skipped_invalid_state}")
+        finally:
+            if report is not None:
+                report.close()
+        print_dry_run_summary(
+            stats, time.perf_counter() - started, args.upsert, changes_path, merge_report
+        )
+    elif args.from_cache:
+        started = time.perf_counter()
+        stats = asyncio.run(
+            import_cache_bulk(
+                args.from_cache,
+                args.batch_size or BULK_BATCH_SIZE,
+                upsert=args.upsert,
+                fuzzy_threshold=fuzzy_threshold,
+                merge_report=merge_report,
+            )
+        )
+        print_bulk_summary(stats, time.perf_counter() - started, args.upsert, merge_report)
+    elif args.workers > 1:
+        import_csv_parallel(
+            csv_path,
+            args.batch_size or BULK_BATCH_SIZE,
+            args.workers,
+            resume=args.resume,
+            upsert=args.upsert,
+            fuzzy_threshold=fuzzy_threshold,
+            merge_report=merge_report,
+        )
+    elif args.bulk or args.upsert or args.fuzzy:
+        started = time.perf_counter()
+        stats = asyncio.run(
+            import_csv_bulk(
+                csv_path,
+                args.batch_size or BULK_BATCH_SIZE,
+                checkpoint_path,
+                resume=args.resume,
+                upsert=args.upsert,
+                fuzzy_threshold=fuzzy_threshold,
+                merge_report=merge_report,
+            )
+        )
+        print_bulk_summary(stats, time.perf_counter() - started, args.upsert, merge_report)
+    else:
+        asyncio.run(
+            import_csv(csv_path, args.batch_size or ROW_BATCH_SIZE, checkpoint_path, args.resume)
+        )
 
 
 if __name__ == "__main__":
-    csv_file = sys.argv[1] if len(sys.argv) > 1 else str(
-        Path(__file__).resolve().parent.parent.parent.parent / "data" / "sample_restaurants.csv"
-    )
-    print(f"Importing from: {csv_file}")
-    asyncio.run(import_csv(csv_file))
+    main()
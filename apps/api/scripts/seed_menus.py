@@ -1,19 +1,37 @@
 """
 Seed sample menus for restaurants.
 
+Each location's menu tree is built in memory with client-side UUIDs, so no
+row needs a round trip for its generated id. Locations are seeded in batches,
+one transaction per batch, and every table of a batch is written with a
+single COPY. Several async workers, each with its own connection, load
+batches concurrently.
+
+With --template, BASE_MENU is written once as a shared template and each
+location gets a single menu row that references it, so storage and seeding
+time no longer grow with the size of the menu.
+
 Usage:
     python -m scripts.seed_menus --all
+    python -m scripts.seed_menus --all --workers 8 --batch-size 1000
+    python -m scripts.seed_menus --all --template
     python -m scripts.seed_menus --state nj --city clinton --slug hunan-wok
     python -m scripts.seed_menus --state nj --force
 """
 
 import argparse
 import asyncio
+import time
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 
+from app.cache import menu_keys
 from app.database import async_session_maker
-from app.models import RestaurantLocation, RestaurantSlug
+from app.invalidation import publish_invalidation
+from app.models import RestaurantSlug
 from app.models.menu import (
     Menu,
     MenuCategory,
@@ -23,6 +41,11 @@ from app.models.menu import (
     ModifierOption,
 )
 
+SEED_BATCH_SIZE = 500
+SEED_WORKERS = 4
+TEMPLATE_NAME = "Sample Menu"
+LOCATION_MENU_NAME = "Main Menu"
+
 BASE_MENU = [
     {
         "name": "Appetizers",
@@ -133,16 +156,124 @@ BASE_MENU = [
 ]
 
 
+# ---------------------------------------------------------------------------
+# Menu trees
+# ---------------------------------------------------------------------------
+
+MENU_COLUMNS = ("id", "restaurant_location_id", "name", "is_active", "is_template", "template_id")
+CATEGORY_COLUMNS = ("id", "menu_id", "name", "description", "sort_order", "is_active")
+ITEM_COLUMNS = (
+    "id", "menu_category_id", "name", "description", "price_cents", "sort_order", "is_active",
+)
+GROUP_COLUMNS = (
+    "id", "name", "description", "min_select", "max_select", "is_required", "sort_order",
+)
+LINK_COLUMNS = ("menu_item_id", "modifier_group_id", "sort_order")
+OPTION_COLUMNS = ("id", "modifier_group_id", "name", "price_cents", "is_default", "sort_order")
+
+
+@dataclass
+class SeedLocation:
+    location_id: uuid.UUID
+    cache_keys: list[str]
+
+
+@dataclass
+class MenuRows:
+    """Rows for a batch of menu trees, ready to COPY."""
+
+    menus: list[tuple] = field(default_factory=list)
+    categories: list[tuple] = field(default_factory=list)
+    items: list[tuple] = field(default_factory=list)
+    groups: list[tuple] = field(default_factory=list)
+    links: list[tuple] = field(default_factory=list)
+    options: list[tuple] = field(default_factory=list)
+
+    def add(self, location_id: uuid.UUID) -> None:
+        """A location menu with its own copy of BASE_MENU."""
+        menu_id = uuid.uuid4()
+        self.menus.append((menu_id, location_id, LOCATION_MENU_NAME, True, False, None))
+        self._add_tree(menu_id)
+
+    def add_template(self, name: str) -> uuid.UUID:
+        menu_id = uuid.uuid4()
+        self.menus.append((menu_id, None, name, True, True, None))
+        self._add_tree(menu_id)
+        return menu_id
+
+    def add_reference(self, location_id: uuid.UUID, template_id: uuid.UUID) -> None:
+        """A location menu that is materialized from a template on read."""
+        self.menus.append(
+            (uuid.uuid4(), location_id, LOCATION_MENU_NAME, True, False, template_id)
+        )
+
+    def _add_tree(self, menu_id: uuid.UUID) -> None:
+        for cat_index, category in enumerate(BASE_MENU):
+            category_id = uuid.uuid4()
+            self.categories.append(
+                (category_id, menu_id, category["name"], category.get("description"),
+                 cat_index, True)
+            )
+
+            for item_index, item in enumerate(category["items"]):
+                item_id = uuid.uuid4()
+                self.items.append(
+                    (item_id, category_id, item["name"], item.get("description"),
+                     item["price_cents"], item_index, True)
+                )
+
+                for group_index, group in enumerate(item.get("modifiers", [])):
+                    group_id = uuid.uuid4()
+                    self.groups.append(
+                        (group_id, group["name"], group.get("description"),
+                         group.get("min_select", 0), group.get("max_select", 0),
+                         group.get("is_required", False), group_index)
+                    )
+                    self.links.append((item_id, group_id, group_index))
+
+                    for option_index, option in enumerate(group.get("options", [])):
+                        self.options.append(
+                            (uuid.uuid4(), group_id, option["name"],
+                             option.get("price_cents", 0), option.get("is_default", False),
+                             option_index)
+                        )
+
+    def tables(self) -> list[tuple[str, tuple[str, ...], list[tuple]]]:
+        """(table, columns, records), parents before children."""
+        return [
+            (Menu.__tablename__, MENU_COLUMNS, self.menus),
+            (MenuCategory.__tablename__, CATEGORY_COLUMNS, self.categories),
+            (MenuItem.__tablename__, ITEM_COLUMNS, self.items),
+            (ModifierGroup.__tablename__, GROUP_COLUMNS, self.groups),
+            (MenuItemModifierGroup.__tablename__, LINK_COLUMNS, self.links),
+            (ModifierOption.__tablename__, OPTION_COLUMNS, self.options),
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Seeding
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SeedStats:
+    created: int = 0
+    replaced: int = 0
+    skipped: int = 0
+    batches: int = 0
+
+
 async def fetch_locations(
     state: str | None,
     city: str | None,
     slug: str | None,
-):
-    query = (
-        select(RestaurantLocation)
-        .join(RestaurantSlug, RestaurantSlug.restaurant_location_id == RestaurantLocation.id)
-        .where(RestaurantSlug.is_canonical.is_(True))
-    )
+) -> list[SeedLocation]:
+    query = select(
+        RestaurantSlug.restaurant_location_id,
+        RestaurantSlug.state_slug,
+        RestaurantSlug.city_slug,
+        RestaurantSlug.restaurant_slug,
+    ).where(RestaurantSlug.is_canonical.is_(True))
 
     if state:
         query = query.where(RestaurantSlug.state_slug == state.lower())
@@ -153,85 +284,139 @@ async def fetch_locations(
 
     async with async_session_maker() as session:
         result = await session.execute(query)
-        return result.scalars().all()
+        return [
+            SeedLocation(location_id, menu_keys(state_slug, city_slug, restaurant_slug))
+            for location_id, state_slug, city_slug, restaurant_slug in result.all()
+        ]
+
+
+def _menu_location(location_ids: list[uuid.UUID]):
+    return Menu.restaurant_location_id.in_(location_ids)
+
 
+async def write_rows(session, rows: MenuRows) -> None:
+    # Callers run a statement through the session first: the asyncpg adapter
+    # opens its transaction lazily, and raw driver calls made before that
+    # would autocommit.
+    conn = await session.connection()
+    raw = (await conn.get_raw_connection()).driver_connection
+    for table, columns, records in rows.tables():
+        if records:
+            await raw.copy_records_to_table(table, records=records, columns=columns)
 
-async def seed_menu_for_location(location: RestaurantLocation, force: bool) -> bool:
+
+async def ensure_template() -> uuid.UUID:
+    """The id of the BASE_MENU template, created on first use."""
     async with async_session_maker() as session:
         async with session.begin():
             existing = await session.execute(
-                select(Menu).where(Menu.restaurant_location_id == location.id)
-            )
-            menu = existing.scalars().first()
-            if menu and not force:
-                return False
-            if menu and force:
-                await session.delete(menu)
-                await session.flush()
-
-            menu = Menu(
-                restaurant_location_id=location.id,
-                name="Main Menu",
-                is_active=True,
+                select(Menu.id)
+                .where(Menu.is_template.is_(True), Menu.name == TEMPLATE_NAME)
+                .order_by(Menu.created_at)
+                .limit(1)
             )
-            session.add(menu)
-            await session.flush()
-
-            for cat_index, category in enumerate(BASE_MENU):
-                menu_category = MenuCategory(
-                    menu_id=menu.id,
-                    name=category["name"],
-                    description=category.get("description"),
-                    sort_order=cat_index,
-                    is_active=True,
-                )
-                session.add(menu_category)
-                await session.flush()
-
-                for item_index, item in enumerate(category["items"]):
-                    menu_item = MenuItem(
-                        menu_category_id=menu_category.id,
-                        name=item["name"],
-                        description=item.get("description"),
-                        price_cents=item["price_cents"],
-                        sort_order=item_index,
-                        is_active=True,
+            template_id = existing.scalar_one_or_none()
+            if template_id is None:
+                rows = MenuRows()
+                template_id = rows.add_template(TEMPLATE_NAME)
+                await write_rows(session, rows)
+                print(f"Created menu template {template_id}.")
+            return template_id
+
+
+async def seed_batch(
+    batch: list[SeedLocation],
+    force: bool,
+    stats: SeedStats,
+    template_id: uuid.UUID | None = None,
+) -> None:
+    """Seed one batch of locations in a single transaction."""
+    location_ids = [location.location_id for location in batch]
+    async with async_session_maker() as session:
+        async with session.begin():
+            existing = set(
+                (
+                    await session.execute(
+                        select(Menu.restaurant_location_id)
+                        .where(_menu_location(location_ids))
+                        .distinct()
                     )
-                    session.add(menu_item)
-                    await session.flush()
-
-                    for group_index, group in enumerate(item.get("modifiers", [])):
-                        modifier_group = ModifierGroup(
-                            name=group["name"],
-                            description=group.get("description"),
-                            min_select=group.get("min_select", 0),
-                            max_select=group.get("max_select", 0),
-                            is_required=group.get("is_required", False),
-                            sort_order=group_index,
-                        )
-                        session.add(modifier_group)
-                        await session.flush()
-
-                        session.add(
-                            MenuItemModifierGroup(
-                                menu_item_id=menu_item.id,
-                                modifier_group_id=modifier_group.id,
-                                sort_order=group_index,
-                            )
+                ).scalars()
+            )
+            if existing and force:
+                # Modifier groups hang off items through the link table, so
+                # the menu cascade would leave them behind.
+                await session.execute(
+                    delete(ModifierGroup).where(
+                        ModifierGroup.id.in_(
+                            select(MenuItemModifierGroup.modifier_group_id)
+                            .join(MenuItem, MenuItem.id == MenuItemModifierGroup.menu_item_id)
+                            .join(MenuCategory, MenuCategory.id == MenuItem.menu_category_id)
+                            .join(Menu, Menu.id == MenuCategory.menu_id)
+                            .where(_menu_location(list(existing)))
                         )
+                    )
+                )
+                await session.execute(delete(Menu).where(_menu_location(list(existing))))
+                targets = batch
+            else:
+                targets = [location for location in batch if location.location_id not in existing]
 
-                        for option_index, option in enumerate(group.get("options", [])):
-                            session.add(
-                                ModifierOption(
-                                    modifier_group_id=modifier_group.id,
-                                    name=option["name"],
-                                    price_cents=option.get("price_cents", 0),
-                                    is_default=option.get("is_default", False),
-                                    sort_order=option_index,
-                                )
-                            )
+            if targets:
+                rows = MenuRows()
+                for location in targets:
+                    if template_id is None:
+                        rows.add(location.location_id)
+                    else:
+                        rows.add_reference(location.location_id, template_id)
+                await write_rows(session, rows)
+
+                await publish_invalidation(
+                    session, keys=[key for location in targets for key in location.cache_keys]
+                )
+
+    replaced = len(existing) if force else 0
+    stats.created += len(targets) - replaced
+    stats.replaced += replaced
+    stats.skipped += len(batch) - len(targets)
+    stats.batches += 1
+
+
+def batches(locations: list[SeedLocation], batch_size: int) -> Iterator[list[SeedLocation]]:
+    for start in range(0, len(locations), batch_size):
+        yield locations[start:start + batch_size]
+
+
+async def seed_worker(
+    pending: Iterator[list[SeedLocation]],
+    force: bool,
+    stats: SeedStats,
+    total: int,
+    template_id: uuid.UUID | None,
+) -> None:
+    # Workers share one iterator; the event loop hands each batch to exactly one.
+    for batch in pending:
+        await seed_batch(batch, force, stats, template_id)
+        done = stats.created + stats.replaced + stats.skipped
+        print(f"  {done}/{total} locations")
 
-        return True
+
+async def seed_menus(
+    locations: list[SeedLocation],
+    force: bool,
+    batch_size: int,
+    workers: int,
+    template_id: uuid.UUID | None = None,
+) -> SeedStats:
+    stats = SeedStats()
+    pending = batches(locations, batch_size)
+    await asyncio.gather(
+        *(
+            seed_worker(pending, force, stats, len(locations), template_id)
+            for _ in range(workers)
+        )
+    )
+    return stats
 
 
 async def main() -> None:
@@ -241,26 +426,47 @@ async def main() -> None:
     parser.add_argument("--city", type=str, help="City slug (e.g. clinton)")
     parser.add_argument("--slug", type=str, help="Restaurant slug")
     parser.add_argument("--force", action="store_true", help="Replace existing menus")
+    parser.add_argument(
+        "--template",
+        action="store_true",
+        help="Point each location at one shared menu template instead of copying the tree",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=SEED_BATCH_SIZE,
+        help=f"Locations per transaction (default {SEED_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SEED_WORKERS,
+        help=f"Concurrent transactions (default {SEED_WORKERS})",
+    )
     args = parser.parse_args()
 
     if not args.all and not (args.state and args.city and args.slug):
         raise SystemExit("Provide --all or --state/--city/--slug")
+    if args.batch_size < 1 or args.workers < 1:
+        raise SystemExit("--batch-size and --workers must be at least 1")
 
     locations = await fetch_locations(args.state, args.city, args.slug)
     if not locations:
         print("No matching restaurants found.")
         return
 
-    created = 0
-    skipped = 0
-    for location in locations:
-        seeded = await seed_menu_for_location(location, args.force)
-        if seeded:
-            created += 1
-        else:
-            skipped += 1
+    started = time.perf_counter()
+    template_id = await ensure_template() if args.template else None
+    stats = await seed_menus(
+        locations, args.force, args.batch_size, args.workers, template_id
+    )
+    elapsed = time.perf_counter() - started
 
-    print(f"Seeded menus: {created}. Skipped: {skipped}.")
+    print(
+        f"Seeded menus: {stats.created}. Replaced: {stats.replaced}. "
+        f"Skipped: {stats.skipped}."
+    )
+    print(f"  {stats.batches} batches in {elapsed:.1f}s")
 
 
 if __name__ == "__main__":
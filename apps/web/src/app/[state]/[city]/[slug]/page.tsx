@@ -1,6 +1,7 @@
 import type { Metadata } from "next";
 import { notFound } from "next/navigation";
 import { apiFetch } from "@/lib/api";
+import { primaryHeaders } from "@/lib/readAfterWrite";
 import type { MenuOut, RestaurantDetail } from "@/lib/types";
 import { menuFromApi } from "@/lib/menu";
 import {
@@ -47,7 +48,8 @@ async function getRestaurant(
 ): Promise<RestaurantDetail | null> {
   try {
     return await apiFetch<RestaurantDetail>(
-      `/restaurants/${state}/${city}/${slug}`
+      `/restaurants/${state}/${city}/${slug}`,
+      { headers: await primaryHeaders() }
     );
   } catch {
     return null;
@@ -60,7 +62,9 @@ async function getMenu(
   slug: string
 ): Promise<MenuOut | null> {
   try {
-    return await apiFetch<MenuOut>(`/menus/${state}/${city}/${slug}`);
+    return await apiFetch<MenuOut>(`/menus/${state}/${city}/${slug}`, {
+      headers: await primaryHeaders(),
+    });
   } catch {
     return null;
   }
@@ -1,5 +1,6 @@
 import { NextResponse } from "next/server";
 import { TEMPLATE_KEYS, type TemplateKey } from "@/components/restaurant-templates/types";
+import { PRIMARY_HEADER } from "@/lib/readAfterWrite";
 
 const INTERNAL_API_URL = process.env.INTERNAL_API_URL || "http://localhost:8001";
 
@@ -59,8 +60,16 @@ export async function POST(request: Request) {
     );
   }
 
-  return new NextResponse(text, {
-    status: 200,
-    headers: { "Content-Type": "application/json" },
-  });
+  // Relay the read-after-write stamp so the page re-render reads the new
+  // template from the primary (see primaryHeaders).
+  const responseHeaders = new Headers({ "Content-Type": "application/json" });
+  const stamp = upstream.headers.get(PRIMARY_HEADER);
+  if (stamp) {
+    responseHeaders.set(PRIMARY_HEADER, stamp);
+  }
+  const cookie = upstream.headers.get("Set-Cookie");
+  if (cookie) {
+    responseHeaders.set("Set-Cookie", cookie);
+  }
+  return new NextResponse(text, { status: 200, headers: responseHeaders });
 }
@@ -0,0 +1,5 @@
+import { proxySitemap } from "@/lib/sitemap";
+
+export async function GET() {
+  return proxySitemap("/sitemap/index.xml");
+}
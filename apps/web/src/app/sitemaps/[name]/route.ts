@@ -0,0 +1,14 @@
+import { proxySitemap } from "@/lib/sitemap";
+
+const SITEMAP_NAME = /^(directory|restaurants-\d+)\.xml$/;
+
+export async function GET(
+  _request: Request,
+  { params }: { params: Promise<{ name: string }> }
+) {
+  const { name } = await params;
+  if (!SITEMAP_NAME.test(name)) {
+    return new Response("Not found", { status: 404 });
+  }
+  return proxySitemap(`/sitemap/${name}`);
+}
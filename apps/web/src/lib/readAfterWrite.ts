@@ -0,0 +1,12 @@
+import { cookies } from "next/headers";
+
+// Set by the API (and relayed by our API routes) after a successful write.
+export const PRIMARY_COOKIE = "takeout_primary_until";
+export const PRIMARY_HEADER = "X-Primary-Until";
+
+// Server components only: echo the browser's read-after-write stamp to the API
+// so a re-render right after a write reads from the primary, not the replica.
+export async function primaryHeaders(): Promise<Record<string, string>> {
+  const stamp = (await cookies()).get(PRIMARY_COOKIE)?.value;
+  return stamp ? { [PRIMARY_HEADER]: stamp } : {};
+}
@@ -0,0 +1,18 @@
+const INTERNAL_API_URL =
+  process.env.INTERNAL_API_URL || "http://localhost:8001";
+
+// Sitemaps are built and cached (gzip) by the API; these handlers only proxy them.
+export async function proxySitemap(apiPath: string): Promise<Response> {
+  const res = await fetch(`${INTERNAL_API_URL}${apiPath}`, {
+    next: { revalidate: 3600 },
+  });
+  if (!res.ok) {
+    return new Response("Not found", { status: res.status === 404 ? 404 : 502 });
+  }
+  return new Response(await res.text(), {
+    headers: {
+      "Content-Type": "application/xml",
+      "Cache-Control": "public, max-age=3600",
+    },
+  });
+}
@@ -239,4 +239,5 @@ export interface SearchResultItem {
   city_slug: string;
   restaurant_slug: string;
   rank: number;
+  distance_miles?: number | null;
 }